@@ -0,0 +1,76 @@
+// Programação (index.html): tabs and schedule cards rendered from data/evento.json (GET /api/agenda)
+
+const agendaTabs = document.getElementById('agenda-tabs');
+const agendaDays = document.getElementById('agenda-days');
+
+function escapeHtml(value) {
+    return String(value ?? '').replace(/[&<>"']/g, (ch) => ({
+        '&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;', "'": '&#39;'
+    }[ch]));
+}
+
+function slotHtml(slot) {
+    const location = slot.location
+        ? `<p class="slot__location"><i class="fa-solid fa-location-dot"></i> ${escapeHtml(slot.location)}</p>`
+        : '';
+    const link = slot.link
+        ? `<a class="btn btn--secondary" href="${escapeHtml(encodeURI(slot.link))}">Saiba Mais</a>`
+        : '';
+    return `
+        <article class="slot">
+            <div class="slot__media"><img src="${escapeHtml(encodeURI(slot.image))}" alt="${escapeHtml(slot.image_alt)}" loading="lazy"></div>
+            <div class="slot__content">
+                <time class="slot__time">${escapeHtml(slot.time)}</time>
+                <h3 class="slot__title">${escapeHtml(slot.title)}</h3>
+                <p class="slot__desc">${escapeHtml(slot.description)}</p>
+                ${location}
+                ${link}
+            </div>
+        </article>`;
+}
+
+function dayPanelHtml(day, index) {
+    return `
+        <div class="day-panel${index === 0 ? ' active' : ''}" id="${escapeHtml(day.id)}">
+            <div class="schedule">${(day.slots || []).map(slotHtml).join('')}</div>
+        </div>`;
+}
+
+function dayTabHtml(day, index) {
+    return `<button class="tab${index === 0 ? ' active' : ''}" data-day="${escapeHtml(day.id)}">${escapeHtml(day.label)}</button>`;
+}
+
+function showDay(dayId) {
+    agendaTabs.querySelectorAll('.tab').forEach(tab => {
+        tab.classList.toggle('active', tab.dataset.day === dayId);
+    });
+    agendaDays.querySelectorAll('.day-panel').forEach(panel => {
+        panel.classList.toggle('active', panel.id === dayId);
+    });
+}
+
+async function renderAgenda() {
+    if (!agendaTabs || !agendaDays) return;
+    try {
+        const response = await fetch('/api/agenda');
+        if (!response.ok) throw new Error(`HTTP ${response.status}`);
+        const { agenda } = await response.json();
+        agendaTabs.innerHTML = agenda.map(dayTabHtml).join('');
+        agendaDays.innerHTML = agenda.map(dayPanelHtml).join('');
+    } catch (err) {
+        console.error('Falha ao carregar a programação:', err);
+        agendaDays.innerHTML = '<p class="schedule__status">Não foi possível carregar a programação. Tente recarregar a página.</p>';
+    } finally {
+        agendaDays.setAttribute('aria-busy', 'false');
+    }
+}
+
+// Tabs are created by renderAgenda(), so clicks are handled on their container
+if (agendaTabs) {
+    agendaTabs.addEventListener('click', (e) => {
+        const tab = e.target.closest('.tab');
+        if (tab) showDay(tab.dataset.day);
+    });
+}
+
+document.addEventListener('DOMContentLoaded', renderAgenda);
@@ -0,0 +1,332 @@
+"""Archive registration tables into columnar Arrow IPC files.
+
+Each table is streamed out of Supabase with keyset pagination on ``id`` and
+written as Arrow IPC (Feather v2) files, partitioned by event and year (taken
+from ``created_at``), under ``ARCHIVE_DIR`` (default ``~/.sanca-week/archive``,
+outside the directory server.py serves, since the files hold personal data):
+
+    ~/.sanca-week/archive/event=hackathon/year=2025/hackathon_inscricoes.arrow
+
+Files are uncompressed by default so ``archive_query.py`` can memory-map them
+and read only the columns an aggregate needs, without copying. ``--compression
+zstd`` (or lz4) makes them several times smaller, but every column read is then
+decompressed into heap memory and the memory map gains nothing. Every row also gets pseudonymous keys so people can be
+matched across events without scanning the personal-data columns:
+
+- ``person_keys``: one key per person in the row (the registrant, then the
+  hackathon members), each the SHA-256 of the normalized e-mail, or of the
+  phone digits when the registrant has no e-mail (minicurso de fibra);
+- ``phone_key``: SHA-256 of the registrant's phone digits. Rows that have both
+  an e-mail and a phone let the queries resolve phone-only keys to the same
+  person's e-mail key.
+
+Migration placeholders (``*@placeholder.com``, ``00000000000``) never become
+keys, and rows of ``hackathon_inscricoes_backup`` that RECRIAR_TABELA_HACKATHON.sql
+copied into ``hackathon_inscricoes`` are skipped so they are not counted twice.
+
+Usage:
+    python archive_job.py                              # every known table
+    python archive_job.py --table hackathon_inscricoes_backup=hackathon
+    python archive_job.py --output /data/archive --compression zstd
+
+Requires ``pyarrow`` (pip install pyarrow) and the same SUPABASE_* variables as
+server.py (the service role key is needed to read past RLS).
+"""
+
+import argparse
+import hashlib
+import logging
+import os
+import re
+from datetime import datetime, timezone
+
+import pyarrow as pa
+import pyarrow.ipc as ipc
+from dotenv import load_dotenv
+from supabase import create_client
+
+logger = logging.getLogger(__name__)
+
+# Personal data: keep it out of the project root that server.py serves
+DEFAULT_OUTPUT = os.getenv('ARCHIVE_DIR') or os.path.join(os.path.expanduser('~'), '.sanca-week', 'archive')
+PAGE_SIZE = 1000
+UNKNOWN_YEAR = 'desconhecido'
+
+# Registration tables and the event each one belongs to
+TABLES = {
+    'inscricoes': 'sanca-week',
+    'hackathon_inscricoes': 'hackathon',
+    'hackathon_inscricoes_backup': 'hackathon',
+    'minicurso_fibra_inscricoes': 'minicurso-fibra',
+    'minicurso_quantica_inscricoes': 'minicurso-quantica',
+}
+
+# Migrated copies of another table: rows already present there are not archived again
+DEDUPE_AGAINST = {
+    'hackathon_inscricoes_backup': 'hackathon_inscricoes',
+}
+
+# Leader first: the hackathon migration filled leader_email from COALESCE(leader_email, email)
+EMAIL_COLUMNS = ('leader_email', 'email')
+MEMBER_EMAIL_COLUMNS = ('member2_email', 'member3_email')
+PHONE_COLUMNS = ('telefone', 'celular')
+PLACEHOLDER_EMAIL_DOMAIN = '@placeholder.com'
+
+
+def _hash(value: str) -> str:
+    return hashlib.sha256(value.encode('utf-8')).hexdigest()
+
+
+def normalized_email(value) -> str:
+    """Lowercased e-mail, or '' for empty values and migration placeholders."""
+    if not isinstance(value, str) or '@' not in value:
+        return ''
+    email = value.strip().lower()
+    return '' if email.endswith(PLACEHOLDER_EMAIL_DOMAIN) else email
+
+
+def registrant_email(row) -> str:
+    for column in EMAIL_COLUMNS:
+        email = normalized_email(row.get(column))
+        if email:
+            return email
+    return ''
+
+
+def phone_key(row) -> str:
+    """Key of the registrant's phone number, ignoring all-zero placeholders."""
+    for column in PHONE_COLUMNS:
+        # Keep the last 11 digits so "+55 16 9..." and "16 9..." match
+        digits = re.sub(r'\D+', '', str(row.get(column) or ''))[-11:]
+        if digits.strip('0'):
+            return _hash(digits)
+    return None
+
+
+def person_keys(row) -> list:
+    """One stable pseudonymous key per person in a row: registrant first, then members."""
+    keys = []
+    email = registrant_email(row)
+    registrant = _hash(email) if email else phone_key(row)
+    if registrant:
+        keys.append(registrant)
+    for column in MEMBER_EMAIL_COLUMNS:
+        email = normalized_email(row.get(column))
+        if email and _hash(email) not in keys:
+            keys.append(_hash(email))
+    return keys
+
+
+def row_year(row) -> str:
+    value = row.get('created_at')
+    if isinstance(value, str) and len(value) >= 4 and value[:4].isdigit():
+        return value[:4]
+    return UNKNOWN_YEAR
+
+
+def parse_timestamp(value):
+    if value is None or isinstance(value, datetime):
+        return value
+    try:
+        return datetime.fromisoformat(str(value).replace('Z', '+00:00'))
+    except ValueError:
+        return None
+
+
+def migration_key(row):
+    """Identify a registration across the backup and live hackathon tables.
+
+    The migration kept ``created_at`` (TIMESTAMP in the old table, TIMESTAMPTZ
+    in the new one, both UTC) and the leader e-mail.
+    """
+    created_at = parse_timestamp(row.get('created_at'))
+    if created_at is not None and created_at.tzinfo is not None:
+        created_at = created_at.astimezone(timezone.utc).replace(tzinfo=None)
+    return created_at, registrant_email(row)
+
+
+def infer_type(column: str, values) -> pa.DataType:
+    """Pick an Arrow type from the first non-null value of a column."""
+    if column == 'created_at' or column.endswith('_at'):
+        return pa.timestamp('us', tz='UTC')
+    for value in values:
+        if value is None:
+            continue
+        if isinstance(value, bool):
+            return pa.bool_()
+        if isinstance(value, int):
+            return pa.int64()
+        if isinstance(value, float):
+            return pa.float64()
+        return pa.string()
+    return pa.string()
+
+
+def coerce(value, type_: pa.DataType):
+    """Convert a JSON value to the column type, using None when it does not fit."""
+    if value is None:
+        return None
+    try:
+        if pa.types.is_timestamp(type_):
+            return parse_timestamp(value)
+        if pa.types.is_boolean(type_):
+            return value if isinstance(value, bool) else str(value).lower() in ('true', 't', 'on', '1')
+        if pa.types.is_integer(type_):
+            return int(value)
+        if pa.types.is_floating(type_):
+            return float(value)
+    except (TypeError, ValueError):
+        return None
+    return value if isinstance(value, str) else str(value)
+
+
+class PartitionWriter:
+    """Lazily opens one IPC file per (event, year) and appends record batches."""
+
+    def __init__(self, output: str, table: str, event: str, schema: pa.Schema, compression):
+        self.output = output
+        self.table = table
+        self.event = event
+        self.schema = schema
+        self.options = ipc.IpcWriteOptions(compression=compression)
+        self._writers = {}
+        self.rows = {}
+
+    def path_for(self, year: str) -> str:
+        return os.path.join(self.output, f'event={self.event}', f'year={year}', f'{self.table}.arrow')
+
+    def write(self, year: str, batch: pa.RecordBatch) -> None:
+        if year not in self._writers:
+            path = self.path_for(year)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            sink = pa.OSFile(path + '.tmp', 'wb')
+            self._writers[year] = (ipc.new_file(sink, self.schema, options=self.options), sink)
+        self._writers[year][0].write_batch(batch)
+        self.rows[year] = self.rows.get(year, 0) + batch.num_rows
+
+    def close(self, commit: bool = True) -> None:
+        for year, (writer, sink) in self._writers.items():
+            writer.close()
+            sink.close()
+            path = self.path_for(year)
+            if commit:
+                # Replace the previous archive of this table only once it is complete
+                os.replace(path + '.tmp', path)
+            else:
+                os.remove(path + '.tmp')
+        self._writers = {}
+
+
+def fetch_pages(supabase, table: str, page_size: int = PAGE_SIZE):
+    """Yield pages of rows ordered by id (keyset pagination, no OFFSET scans)."""
+    last_id = None
+    while True:
+        query = supabase.table(table).select('*').order('id').limit(page_size)
+        if last_id is not None:
+            query = query.gt('id', last_id)
+        page = query.execute().data or []
+        if page:
+            yield page
+        if len(page) < page_size:
+            return
+        last_id = page[-1]['id']
+
+
+def archive_table(supabase, table: str, event: str, output: str, compression=None,
+                  page_size: int = PAGE_SIZE, skip_keys=None) -> dict:
+    """Stream one table into its partitions; returns rows written per year.
+
+    Rows whose :func:`migration_key` is in ``skip_keys`` are left out.
+    """
+    writer = None
+    try:
+        for page in fetch_pages(supabase, table, page_size):
+            if skip_keys:
+                page = [row for row in page if migration_key(row) not in skip_keys]
+                if not page:
+                    continue
+            if writer is None:
+                columns = list(page[0].keys())
+                fields = [pa.field(column, infer_type(column, [row.get(column) for row in page])) for column in columns]
+                fields += [
+                    pa.field('person_keys', pa.list_(pa.string())),
+                    pa.field('phone_key', pa.string()),
+                    pa.field('source_table', pa.string()),
+                ]
+                writer = PartitionWriter(output, table, event, pa.schema(fields), compression)
+
+            by_year = {}
+            for row in page:
+                by_year.setdefault(row_year(row), []).append(row)
+
+            for year, rows in by_year.items():
+                arrays = []
+                for field in writer.schema:
+                    if field.name == 'person_keys':
+                        values = [person_keys(row) for row in rows]
+                    elif field.name == 'phone_key':
+                        values = [phone_key(row) for row in rows]
+                    elif field.name == 'source_table':
+                        values = [table] * len(rows)
+                    else:
+                        values = [coerce(row.get(field.name), field.type) for row in rows]
+                    arrays.append(pa.array(values, type=field.type))
+                writer.write(year, pa.RecordBatch.from_arrays(arrays, schema=writer.schema))
+    except Exception:
+        if writer is not None:
+            writer.close(commit=False)
+        raise
+
+    if writer is None:
+        return {}
+    writer.close()
+    return writer.rows
+
+
+def migration_keys(supabase, table: str, page_size: int = PAGE_SIZE) -> set:
+    return {migration_key(row) for page in fetch_pages(supabase, table, page_size) for row in page}
+
+
+def parse_table_option(value: str):
+    table, _, event = value.partition('=')
+    if not table or not event:
+        raise argparse.ArgumentTypeError('use tabela=evento, ex.: inscricoes_2024=sanca-week')
+    return table, event
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--output', default=DEFAULT_OUTPUT)
+    parser.add_argument('--table', action='append', type=parse_table_option,
+                        help='tabela=evento a arquivar (repetível); padrão: todas as tabelas conhecidas')
+    parser.add_argument('--compression', choices=['none', 'zstd', 'lz4'], default='none',
+                        help='none permite memory-map sem cópia; zstd/lz4 reduzem o disco, mas a leitura descomprime em memória')
+    parser.add_argument('--page-size', type=int, default=PAGE_SIZE)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    load_dotenv()
+    supabase = create_client(
+        os.getenv('SUPABASE_URL'),
+        os.getenv('SUPABASE_SERVICE_ROLE_KEY') or os.getenv('SUPABASE_KEY'),
+    )
+
+    compression = None if args.compression == 'none' else args.compression
+    tables = args.table or list(TABLES.items())
+    for table, event in tables:
+        try:
+            skip_keys = None
+            if table in DEDUPE_AGAINST:
+                skip_keys = migration_keys(supabase, DEDUPE_AGAINST[table], args.page_size)
+            rows = archive_table(supabase, table, event, args.output, compression, args.page_size, skip_keys)
+        except Exception as e:
+            # Tables such as the hackathon backup may not exist in every project
+            logger.error(f"Falha ao arquivar {table}: {e}")
+            continue
+        total = sum(rows.values())
+        detail = ', '.join(f'{year}: {count}' for year, count in sorted(rows.items())) or 'vazia'
+        logger.info(f"{table} -> event={event}: {total} linhas ({detail})")
+
+
+if __name__ == '__main__':
+    main()
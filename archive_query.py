@@ -0,0 +1,142 @@
+"""Aggregate queries over the registration archive written by archive_job.py.
+
+The archive is opened as a hive-partitioned Arrow dataset on a memory-mapped
+local filesystem: only the columns a question needs are read (without copying
+when the files are uncompressed, the archive_job.py default), and the
+aggregations run as vectorized pyarrow.compute kernels instead of row loops
+or queries against the live database.
+
+People are counted from ``person_keys`` (registrants and hackathon members);
+phone-only keys are mapped to the e-mail key of the same phone when some other
+registration has both. Someone who only ever registered by phone and by an
+e-mail never paired with that phone still counts as two people.
+
+Usage:
+    python archive_query.py                     # summary of ~/.sanca-week/archive (ARCHIVE_DIR)
+    python archive_query.py /data/archive --overlap hackathon sanca-week
+"""
+
+import argparse
+import os
+
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+from pyarrow import fs
+
+# Same default as archive_job.py
+DEFAULT_ARCHIVE = os.getenv('ARCHIVE_DIR') or os.path.join(os.path.expanduser('~'), '.sanca-week', 'archive')
+
+
+def open_archive(root: str = DEFAULT_ARCHIVE) -> ds.Dataset:
+    """Open the archive with event/year partition columns."""
+    return ds.dataset(
+        root,
+        format='ipc',
+        partitioning=ds.partitioning(pa.schema([('event', pa.string()), ('year', pa.string())]), flavor='hive'),
+        filesystem=fs.LocalFileSystem(use_mmap=True),
+        exclude_invalid_files=True,
+    )
+
+
+def person_aliases(dataset: ds.Dataset) -> pa.Table:
+    """phone_key -> e-mail key, from rows whose registrant has both.
+
+    Lets a phone-only registration (minicurso de fibra) count as the same
+    person as their e-mail registrations in other events.
+    """
+    table = dataset.to_table(columns=['person_keys', 'phone_key'], filter=ds.field('phone_key').is_valid())
+    first_key = pc.list_element(table['person_keys'], 0)
+    table = pa.table({'phone_key': table['phone_key'], 'email_key': first_key})
+    table = table.filter(pc.and_(pc.is_valid(table['email_key']), pc.not_equal(table['email_key'], table['phone_key'])))
+    return table.group_by('phone_key').aggregate([('email_key', 'min')])
+
+
+def people(dataset: ds.Dataset, filter_=None) -> pa.Table:
+    """One row per person per registration (hackathon members included): person_key, event, year."""
+    table = dataset.to_table(columns=['person_keys', 'event', 'year'], filter=filter_)
+    parents = pc.list_parent_indices(table['person_keys'])
+    keys = pc.list_flatten(table['person_keys'])
+
+    aliases = person_aliases(dataset)
+    match = pc.index_in(keys, value_set=aliases['phone_key'])
+    keys = pc.if_else(pc.is_valid(match), pc.take(aliases['email_key_min'], match), keys)
+
+    return pa.table({
+        'person_key': keys,
+        'event': pc.take(table['event'], parents),
+        'year': pc.take(table['year'], parents),
+    })
+
+
+def registrations_by_event_year(dataset: ds.Dataset) -> pa.Table:
+    """Number of registrations and distinct people per event and year."""
+    rows = dataset.to_table(columns=['event', 'year'])
+    registrations = rows.group_by(['event', 'year']).aggregate([([], 'count_all')])
+    persons = people(dataset).group_by(['event', 'year']).aggregate([('person_key', 'count_distinct')])
+    joined = registrations.join(persons, ['event', 'year'], join_type='left outer')
+    return pa.table({
+        'event': joined['event'],
+        'year': joined['year'],
+        'inscricoes': joined['count_all'],
+        'pessoas': pc.fill_null(joined['person_key_count_distinct'], 0),
+    }).sort_by([('event', 'ascending'), ('year', 'ascending')])
+
+
+def _editions_per_person(dataset: ds.Dataset, filter_=None) -> pa.Table:
+    table = people(dataset, filter_)
+    edition = pc.binary_join_element_wise(table['event'], table['year'], '/')
+    table = table.append_column('edition', edition)
+    return table.group_by('person_key').aggregate([('edition', 'count_distinct'), ('event', 'count_distinct')])
+
+
+def returning_people(dataset: ds.Dataset) -> dict:
+    """How many people registered in more than one edition (event/year) or event."""
+    per_person = _editions_per_person(dataset)
+    editions = per_person['edition_count_distinct']
+    events = per_person['event_count_distinct']
+    histogram = per_person.group_by('edition_count_distinct').aggregate([('person_key', 'count')])
+    return {
+        'pessoas': per_person.num_rows,
+        'em_mais_de_uma_edicao': pc.sum(pc.greater(editions, 1)).as_py() or 0,
+        'em_mais_de_um_evento': pc.sum(pc.greater(events, 1)).as_py() or 0,
+        'edicoes_por_pessoa': dict(sorted(zip(
+            histogram['edition_count_distinct'].to_pylist(),
+            histogram['person_key_count'].to_pylist(),
+        ))),
+    }
+
+
+def event_overlap(dataset: ds.Dataset, event_a: str, event_b: str) -> int:
+    """Number of people registered in both events (any year)."""
+    table = people(dataset, ds.field('event').isin([event_a, event_b]))
+    per_person = table.group_by('person_key').aggregate([('event', 'count_distinct')])
+    return pc.sum(pc.equal(per_person['event_count_distinct'], 2)).as_py() or 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('archive', nargs='?', default=DEFAULT_ARCHIVE)
+    parser.add_argument('--overlap', nargs=2, metavar=('EVENTO_A', 'EVENTO_B'),
+                        help='conta pessoas inscritas nos dois eventos')
+    args = parser.parse_args()
+
+    dataset = open_archive(args.archive)
+
+    print(f"{'evento':<22} {'ano':<13} {'inscrições':>10} {'pessoas':>8}")
+    for row in registrations_by_event_year(dataset).to_pylist():
+        print(f"{row['event']:<22} {row['year']:<13} {row['inscricoes']:>10} {row['pessoas']:>8}")
+
+    summary = returning_people(dataset)
+    print(f"\nPessoas distintas: {summary['pessoas']}")
+    print(f"Voltaram em mais de uma edição: {summary['em_mais_de_uma_edicao']}")
+    print(f"Participaram de mais de um evento: {summary['em_mais_de_um_evento']}")
+    print(f"Edições por pessoa: {summary['edicoes_por_pessoa']}")
+
+    if args.overlap:
+        event_a, event_b = args.overlap
+        print(f"\nInscritos em {event_a} e {event_b}: {event_overlap(dataset, event_a, event_b)}")
+
+
+if __name__ == '__main__':
+    main()
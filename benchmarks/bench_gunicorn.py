@@ -0,0 +1,225 @@
+"""Sweep gunicorn worker/thread configurations against a local Supabase stub.
+
+The stub answers the PostgREST calls made by server.py after a configurable
+delay, imitating the network round trip to Supabase. For every configuration
+the script starts gunicorn (with gunicorn.conf.py), drives it with a fixed
+number of concurrent keep-alive clients and reports throughput and latency.
+The "knee" is the smallest configuration (workers x threads, then fewer
+workers) whose throughput is within ``--knee-gain`` of the best one measured.
+
+Usage:
+    python benchmarks/bench_gunicorn.py --workers 1,2,4 --threads 1,4,8,16 \\
+        --concurrency 64 --duration 10 --backend-latency 0.08
+"""
+
+import argparse
+import http.client
+import itertools
+import json
+import os
+import signal
+import socket
+import statistics
+import subprocess
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlencode
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# supabase-py validates that the key looks like a JWT
+STUB_KEY = 'eyJhbGciOiJIUzI1NiJ9.eyJyb2xlIjoic2VydmljZV9yb2xlIn0.c3R1Yg'
+ENDPOINT = '/api/minicurso-fibra'
+FORM_BODY = urlencode({'nome': 'Aluno Benchmark', 'telefone': '16999999999', 'nusp': '1234567'})
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+class StubSupabaseHandler(BaseHTTPRequestHandler):
+    """Minimal PostgREST imitation: inserts echo the row with an id, selects return []."""
+
+    protocol_version = 'HTTP/1.1'
+    latency = 0.08
+    counter = itertools.count(1)
+
+    def _reply(self, payload):
+        time.sleep(self.latency)
+        body = json.dumps(payload).encode()
+        self.send_response(201 if self.command == 'POST' else 200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        row = json.loads(self.rfile.read(length) or b'{}')
+        rows = row if isinstance(row, list) else [row]
+        self._reply([dict(r, id=next(self.counter)) for r in rows])
+
+    def do_GET(self):
+        self._reply([])
+
+    def log_message(self, *args):
+        pass
+
+
+def start_stub(latency: float) -> ThreadingHTTPServer:
+    StubSupabaseHandler.latency = latency
+    server = ThreadingHTTPServer(('127.0.0.1', free_port()), StubSupabaseHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def wait_for_port(port: int, timeout: float = 30.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with socket.create_connection(('127.0.0.1', port), timeout=0.5):
+                return True
+        except OSError:
+            time.sleep(0.2)
+    return False
+
+
+def start_gunicorn(port: int, stub_url: str, workers: int, threads: int) -> subprocess.Popen:
+    env = dict(
+        os.environ,
+        PORT=str(port),
+        SUPABASE_URL=stub_url,
+        SUPABASE_SERVICE_ROLE_KEY=STUB_KEY,
+        WEB_CONCURRENCY=str(workers),
+        GUNICORN_THREADS=str(threads),
+        GUNICORN_LOG_LEVEL='warning',
+    )
+    return subprocess.Popen(
+        [sys.executable, '-m', 'gunicorn', '--access-logfile', '/dev/null', 'server:app'],
+        cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+
+
+def run_load(port: int, concurrency: int, duration: float) -> dict:
+    """Drive the endpoint with ``concurrency`` keep-alive clients for ``duration`` seconds."""
+    latencies = []
+    errors = 0
+    lock = threading.Lock()
+    deadline = time.monotonic() + duration
+    headers = {'Content-Type': 'application/x-www-form-urlencoded'}
+
+    def client():
+        nonlocal errors
+        conn = http.client.HTTPConnection('127.0.0.1', port, timeout=30)
+        local, local_errors = [], 0
+        while time.monotonic() < deadline:
+            start = time.perf_counter()
+            try:
+                conn.request('POST', ENDPOINT, FORM_BODY, headers)
+                response = conn.getresponse()
+                response.read()
+                if response.status != 200:
+                    local_errors += 1
+            except (OSError, http.client.HTTPException):
+                local_errors += 1
+                conn.close()
+                conn = http.client.HTTPConnection('127.0.0.1', port, timeout=30)
+                continue
+            local.append(time.perf_counter() - start)
+        conn.close()
+        with lock:
+            latencies.extend(local)
+            errors += local_errors
+
+    started = time.monotonic()
+    pool = [threading.Thread(target=client) for _ in range(concurrency)]
+    for t in pool:
+        t.start()
+    for t in pool:
+        t.join()
+    elapsed = time.monotonic() - started
+
+    latencies.sort()
+    percentile = lambda p: latencies[min(len(latencies) - 1, int(len(latencies) * p))] * 1000 if latencies else 0.0
+    return {
+        'requests': len(latencies),
+        'errors': errors,
+        'rps': len(latencies) / elapsed,
+        'p50_ms': statistics.median(latencies) * 1000 if latencies else 0.0,
+        'p95_ms': percentile(0.95),
+        'p99_ms': percentile(0.99),
+    }
+
+
+def find_knee(results, min_gain: float):
+    """Smallest configuration within ``min_gain`` of the best throughput.
+
+    Every configuration is compared with the best one, so a plateau between two
+    small configurations (or between the worker and thread dimensions) cannot
+    stop the search early. Ties prefer fewer workers, which cost more memory
+    than threads. Configurations with errors are only picked if all have them.
+    """
+    if not results:
+        return None
+    candidates = [r for r in results if not r['errors']] or results
+    best = max(r['rps'] for r in candidates)
+    near_best = [r for r in candidates if r['rps'] >= best * (1 - min_gain)]
+    return min(near_best, key=lambda r: (r['workers'] * r['threads'], r['workers'], -r['rps']))
+
+
+def parse_list(value: str):
+    return [int(item) for item in value.split(',') if item.strip()]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--workers', type=parse_list, default=[1, 2, 4])
+    parser.add_argument('--threads', type=parse_list, default=[1, 4, 8, 16])
+    parser.add_argument('--concurrency', type=int, default=64)
+    parser.add_argument('--duration', type=float, default=10.0)
+    parser.add_argument('--backend-latency', type=float, default=0.08, help='Supabase round trip in seconds')
+    parser.add_argument('--knee-gain', type=float, default=0.05,
+                        help='Throughput a smaller configuration may give up relative to the best one')
+    args = parser.parse_args()
+
+    stub = start_stub(args.backend_latency)
+    stub_url = f'http://127.0.0.1:{stub.server_address[1]}'
+    print(f"Stub Supabase em {stub_url} (latência {args.backend_latency * 1000:.0f} ms), "
+          f"{args.concurrency} clientes, {args.duration:.0f}s por configuração\n")
+    print(f"{'workers':>7} {'threads':>7} {'req/s':>9} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'erros':>6}")
+
+    results = []
+    try:
+        for workers, threads in itertools.product(args.workers, args.threads):
+            port = free_port()
+            proc = start_gunicorn(port, stub_url, workers, threads)
+            try:
+                if not wait_for_port(port):
+                    print(f"{workers:>7} {threads:>7}  gunicorn não iniciou")
+                    continue
+                run_load(port, min(args.concurrency, 8), 1.0)  # warm-up
+                result = dict(run_load(port, args.concurrency, args.duration), workers=workers, threads=threads)
+                results.append(result)
+                print(f"{workers:>7} {threads:>7} {result['rps']:>9.1f} {result['p50_ms']:>8.1f} "
+                      f"{result['p95_ms']:>8.1f} {result['p99_ms']:>8.1f} {result['errors']:>6}")
+            finally:
+                proc.send_signal(signal.SIGTERM)
+                try:
+                    proc.wait(timeout=40)
+                except subprocess.TimeoutExpired:
+                    proc.kill()
+    finally:
+        stub.shutdown()
+
+    knee = find_knee(results, args.knee_gain)
+    if knee:
+        print(f"\nJoelho da curva: {knee['workers']} workers x {knee['threads']} threads "
+              f"({knee['rps']:.1f} req/s). Use WEB_CONCURRENCY={knee['workers']} GUNICORN_THREADS={knee['threads']}.")
+
+
+if __name__ == '__main__':
+    main()
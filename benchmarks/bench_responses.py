@@ -0,0 +1,170 @@
+"""Benchmark: per-request CPU of the API endpoints, jsonify vs responses.py.
+
+Every case is a whole request through ``app.test_client()`` (routing, form
+parsing, validation, the Supabase call and the response), with Supabase
+replaced by an in-memory stub so only the server's own CPU is measured. Each
+case runs twice: once with the helpers in ``responses.py`` and once with them
+swapped for the previous ``jsonify({...}), status`` path. Log output is muted
+so terminal I/O does not dominate the numbers.
+
+Usage:
+    python benchmarks/bench_responses.py [--iterations 2000]
+"""
+
+import argparse
+import itertools
+import logging
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.pop('SMTP_HOST', None)
+os.environ.pop('TRAFFIC_CAPTURE_FILE', None)
+
+import orjson  # noqa: E402
+from flask import jsonify  # noqa: E402
+
+import responses  # noqa: E402
+import server  # noqa: E402
+
+ADMIN_TOKEN = 'bench-admin-token'
+TEAMS = 400
+
+
+class StubResult:
+    def __init__(self, data):
+        self.data = data
+        self.error = None
+
+
+class StubQuery:
+    """Chainable imitation of the supabase-py query builder."""
+
+    ids = itertools.count(1)
+
+    def __init__(self):
+        self.row = None
+
+    def insert(self, row):
+        self.row = row
+        return self
+
+    def select(self, *args, **kwargs):
+        return self
+
+    def limit(self, *args):
+        return self
+
+    def execute(self):
+        return StubResult([{**self.row, 'id': next(self.ids)}] if self.row else [])
+
+
+class StubSupabase:
+    def table(self, name):
+        return StubQuery()
+
+
+def legacy_json_response(obj, status=200):
+    return jsonify(obj), status
+
+
+def use_legacy(enabled: bool) -> None:
+    """Swap the responses.py helpers used by server.py for the jsonify path (or back)."""
+    if enabled:
+        server.json_response = legacy_json_response
+        responses.StaticResponse.response = lambda self: (jsonify(LEGACY_BODIES[id(self)]), self.status)
+    else:
+        server.json_response = responses.json_response
+        responses.StaticResponse.response = STATIC_RESPONSE
+
+
+STATIC_RESPONSE = responses.StaticResponse.response
+# Bodies decoded once, so the legacy path pays only for jsonify
+LEGACY_BODIES = {
+    id(value): orjson.loads(value.body)
+    for value in vars(responses).values()
+    if isinstance(value, responses.StaticResponse)
+}
+
+counter = itertools.count()
+
+
+def hackathon_form():
+    n = next(counter)
+    return {
+        'team_name': f'Equipe bench {n}', 'leader_name': 'Aluno Benchmark',
+        'leader_email': f'lider{n}@bench.example.com', 'celular': '16999999999',
+        'leader_university': 'USP', 'terms_accepted': 'on',
+    }
+
+
+INSCRICAO_FORM = {
+    'nome': 'Aluno Benchmark', 'email': 'aluno@bench.example.com', 'telefone': '16999999999',
+    'faculdade': 'USP', 'curso': 'Engenharia Elétrica', 'ingresso': '2024',
+}
+
+# (endpoint, case, method, request kwargs or a callable returning them)
+CASES = [
+    ('/api/inscricao', 'sucesso', 'post', {'data': INSCRICAO_FORM}),
+    ('/api/inscricao', 'campos faltando', 'post', {'data': {'nome': 'Aluno'}}),
+    ('/api/inscricao', 'honeypot', 'post', {'data': {**INSCRICAO_FORM, '_hp': 'x'}}),
+    ('/api/hackathon', 'sucesso', 'post', lambda: {'data': hackathon_form()}),
+    ('/api/hackathon', 'conflito (409)', 'post', {'data': {**hackathon_form(), 'team_name': 'Equipe 1'}}),
+    ('/api/minicurso-fibra', 'sucesso', 'post', {'data': {'nome': 'Aluno Benchmark', 'telefone': '16999999999'}}),
+    ('/api/minicurso-fibra', 'campos faltando', 'post', {'data': {'nome': 'Aluno'}}),
+    ('/api/minicurso-quantica', 'sucesso', 'post',
+     {'data': {'nome': 'Aluno Benchmark', 'telefone': '16999999999', 'email': 'aluno@bench.example.com'}}),
+    ('/api/health', 'healthy', 'get', {}),
+    ('/api/hackathon/conflitos', f'relatório ({TEAMS} equipes)', 'get', {'headers': {'X-Admin-Token': ADMIN_TOKEN}}),
+    ('/api/hackathon/conflitos', 'sem token', 'get', {}),
+    ('/api/nao-existe', 'Not found', 'get', {}),
+]
+
+
+def setup() -> None:
+    server.get_supabase_client = StubSupabase
+    server.ADMIN_TOKEN = ADMIN_TOKEN
+    # Every team shares its e-mail with the next one, so the report has TEAMS rows
+    server.hackathon_index.load([
+        {'id': i, 'team_name': f'Equipe {i}', 'leader_email': f'aluno{i}@usp.br', 'member2_email': f'aluno{i + 1}@usp.br'}
+        for i in range(1, TEAMS + 1)
+    ])
+    logging.disable(logging.CRITICAL)
+
+
+def cpu_per_request(client, method: str, endpoint: str, kwargs, iterations: int) -> float:
+    """Return the CPU time per request in microseconds (best of 3 runs)."""
+    call = getattr(client, method)
+    best = float('inf')
+    for _ in range(3):
+        start = time.process_time()
+        for _ in range(iterations):
+            call(endpoint, **(kwargs() if callable(kwargs) else kwargs)).get_data()
+        best = min(best, time.process_time() - start)
+    return best / iterations * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--iterations', type=int, default=2000)
+    args = parser.parse_args()
+
+    setup()
+    client = server.app.test_client()
+    print(f"Encoder: orjson {orjson.__version__} | {args.iterations} requisições por caso\n")
+    print(f"{'endpoint':<26} {'caso':<26} {'jsonify µs':>11} {'novo µs':>9} {'redução':>8}")
+
+    for endpoint, case, method, kwargs in CASES:
+        # Large bodies need fewer iterations to give a stable reading
+        iterations = max(args.iterations // 20, 1) if 'relatório' in case else args.iterations
+        use_legacy(True)
+        old_us = cpu_per_request(client, method, endpoint, kwargs, iterations)
+        use_legacy(False)
+        new_us = cpu_per_request(client, method, endpoint, kwargs, iterations)
+        reduction = (1 - new_us / old_us) * 100 if old_us else 0.0
+        print(f"{endpoint:<26} {case:<26} {old_us:>11.1f} {new_us:>9.1f} {reduction:>7.1f}%")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,201 @@
+"""Replay a traffic capture (see traffic_capture.py) against a staging server.
+
+Requests are fired at their original inter-arrival times divided by
+``--speed`` (1x-50x), each one as its own asyncio task so slow responses never
+delay the following arrivals. Request bodies are synthesized from the captured
+shapes (same fields, kinds and lengths). E-mails, team names and digit
+fields mix a per-run nonce (the start timestamp, or ``--nonce``) with the
+request number, so neither the requests of one run nor two rehearsals against
+the same staging database collide on the unique phone/e-mail/team checks.
+Digit fields are the request number plus an offset hashed from the nonce,
+modulo the field length: every digit depends on the nonce, and the values of
+one run stay distinct.
+
+At the end it prints, per route, the latency distribution observed during the
+replay next to the handling times recorded in the capture, plus how far the
+scheduler drifted from the intended timeline. ``--output`` saves the raw
+results as JSON so two builds can be compared.
+
+Usage:
+    python benchmarks/replay_traffic.py capture.jsonl --target https://staging.example.com --speed 10
+
+WARNING: POST requests create real rows on the target. Point it at staging only.
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import statistics
+import string
+import sys
+import time
+from collections import defaultdict
+
+import httpx
+
+MIN_SPEED = 1.0
+MAX_SPEED = 50.0
+
+
+def load_capture(path: str, routes=None):
+    """Read envelopes sorted by arrival time, optionally filtered by route prefix."""
+    envelopes = []
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                envelope = json.loads(line)
+            except ValueError:
+                continue
+            if routes and not any(envelope.get('p', '').startswith(prefix) for prefix in routes):
+                continue
+            envelopes.append(envelope)
+    envelopes.sort(key=lambda e: e['t'])
+    return envelopes
+
+
+def to_letters(n: int) -> str:
+    letters = ''
+    while True:
+        letters = string.ascii_lowercase[n % 26] + letters
+        n //= 26
+        if not n:
+            return letters
+
+
+def nonce_offset(nonce: int, length: int) -> int:
+    """Offset in [0, 10**length) derived from the run nonce."""
+    digest = hashlib.sha256(f'replay:{nonce}'.encode()).digest()
+    return int.from_bytes(digest, 'big') % 10 ** length
+
+
+def synthesize_value(shape: str, seq: int, field: str, nonce: int = 0) -> str:
+    """Build a fake value with the same kind and length as the captured one."""
+    kind, length = shape[:1], int(shape[1:] or 0)
+    if kind == 'b':
+        return 'on'
+    if kind == 'n':
+        return ''
+    if kind == 'd':
+        # Distinct per request within a run; another nonce shifts the whole range
+        return str((nonce_offset(nonce, length) + seq) % 10 ** length).zfill(length) if length else ''
+    if kind == 'e':
+        return f'replay{nonce}.{seq}.{field}@example.com'
+    # Unique prefix per run and request (e.g. team names must not collide), padded to the captured length
+    prefix = f'{to_letters(nonce)}{to_letters(seq)}'
+    return (prefix + 'x' * length)[:max(length, len(prefix))]
+
+
+def synthesize_mapping(shape: dict, seq: int, nonce: int = 0) -> dict:
+    return {field: synthesize_value(kind, seq, field, nonce) for field, kind in shape.items()}
+
+
+async def fire(client, envelope, seq, nonce, results):
+    """Send one synthesized request and record its outcome."""
+    kwargs = {}
+    if envelope.get('q'):
+        kwargs['params'] = synthesize_mapping(envelope['q'], seq, nonce)
+    if envelope.get('c') == 'f':
+        kwargs['data'] = synthesize_mapping(envelope.get('b', {}), seq, nonce)
+    elif envelope.get('c') == 'j':
+        kwargs['json'] = synthesize_mapping(envelope.get('b', {}), seq, nonce)
+
+    route = envelope.get('r') or envelope['p']
+    start = time.perf_counter()
+    try:
+        response = await client.request(envelope['m'], envelope['p'], **kwargs)
+        status = response.status_code
+    except httpx.HTTPError as e:
+        status = type(e).__name__
+    results.append({
+        'route': route,
+        'status': status,
+        'latency_ms': (time.perf_counter() - start) * 1000,
+        'captured_ms': envelope.get('d'),
+        'captured_status': envelope.get('s'),
+    })
+
+
+async def replay(envelopes, target: str, speed: float, max_connections: int, timeout: float, nonce: int):
+    """Fire every envelope at its scaled offset; returns (results, schedule lags in ms)."""
+    results, lags, tasks = [], [], []
+    limits = httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections)
+    loop = asyncio.get_running_loop()
+
+    async with httpx.AsyncClient(base_url=target, limits=limits, timeout=timeout) as client:
+        origin = envelopes[0]['t']
+        started = loop.time()
+        for seq, envelope in enumerate(envelopes):
+            due = started + (envelope['t'] - origin) / speed
+            delay = due - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            lags.append(max(0.0, loop.time() - due) * 1000)
+            tasks.append(asyncio.create_task(fire(client, envelope, seq, nonce, results)))
+        await asyncio.gather(*tasks)
+    return results, lags
+
+
+def percentile(values, p: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * p))]
+
+
+def summarize(results, lags, wall_time: float, capture_span: float, speed: float):
+    by_route = defaultdict(list)
+    for result in results:
+        by_route[result['route']].append(result)
+
+    print(f"{len(results)} requisições em {wall_time:.1f}s "
+          f"(captura de {capture_span:.1f}s a {speed:g}x = {capture_span / speed:.1f}s previstos)")
+    print(f"Atraso do agendador: p50 {percentile(lags, 0.5):.1f} ms, p99 {percentile(lags, 0.99):.1f} ms, "
+          f"máx {max(lags, default=0):.1f} ms\n")
+    print(f"{'rota':<28} {'n':>5} {'erros':>5} {'p50':>8} {'p95':>8} {'p99':>8} │ {'capt p50':>8} {'capt p95':>8}")
+    for route, items in sorted(by_route.items()):
+        latencies = [item['latency_ms'] for item in items]
+        captured = [item['captured_ms'] for item in items if item['captured_ms'] is not None]
+        errors = sum(1 for item in items if not isinstance(item['status'], int) or item['status'] >= 500)
+        print(f"{route:<28} {len(items):>5} {errors:>5} "
+              f"{statistics.median(latencies):>8.1f} {percentile(latencies, 0.95):>8.1f} {percentile(latencies, 0.99):>8.1f} │ "
+              f"{percentile(captured, 0.5):>8.1f} {percentile(captured, 0.95):>8.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('capture', help='Arquivo gerado com TRAFFIC_CAPTURE_FILE')
+    parser.add_argument('--target', required=True, help='URL base do servidor de staging')
+    parser.add_argument('--speed', type=float, default=1.0, help=f'Fator de aceleração ({MIN_SPEED:g}-{MAX_SPEED:g})')
+    parser.add_argument('--route', action='append', help='Reproduz apenas caminhos com este prefixo (repetível)')
+    parser.add_argument('--max-connections', type=int, default=500)
+    parser.add_argument('--timeout', type=float, default=30.0)
+    parser.add_argument('--output', help='Salva os resultados brutos em JSON')
+    parser.add_argument('--nonce', type=int, default=int(time.time()),
+                        help='Identificador da execução misturado aos dados gerados (padrão: horário Unix)')
+    args = parser.parse_args()
+
+    if not MIN_SPEED <= args.speed <= MAX_SPEED:
+        parser.error(f'--speed deve estar entre {MIN_SPEED:g} e {MAX_SPEED:g}')
+
+    envelopes = load_capture(args.capture, args.route)
+    if not envelopes:
+        print('Nenhuma requisição na captura.', file=sys.stderr)
+        sys.exit(1)
+
+    capture_span = envelopes[-1]['t'] - envelopes[0]['t']
+    started = time.perf_counter()
+    print(f"Nonce da execução: {args.nonce}")
+    results, lags = asyncio.run(replay(envelopes, args.target, args.speed, args.max_connections, args.timeout, args.nonce))
+    summarize(results, lags, time.perf_counter() - started, capture_span, args.speed)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump({'target': args.target, 'speed': args.speed, 'nonce': args.nonce, 'results': results, 'lags_ms': lags}, f)
+
+
+if __name__ == '__main__':
+    main()
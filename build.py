@@ -0,0 +1,565 @@
+"""Build minified per-page CSS/JS bundles and rewritten HTML pages into dist/.
+
+For every HTML page in the project root:
+
+- the local stylesheets it links are concatenated, rules whose classes/ids do
+  not appear anywhere in the page or its scripts are removed, and the result is
+  minified into ``dist/assets/<page>.<hash>.css``;
+- the rules needed to paint the header and the first section are inlined in a
+  ``<style>`` tag and the full bundle is loaded without blocking rendering;
+- the local scripts are concatenated in page order and minified into
+  ``dist/assets/<page>.<hash>.js`` (with ``rjsmin`` when installed, otherwise a
+  conservative comment/whitespace stripper);
+- ``<link rel="preload">`` hints for both bundles are added to ``<head>``.
+
+``dist/manifest.json`` lists the preload ``Link`` header of each page (sent by
+server.py) and ``dist/report.json`` the page weight before and after the build,
+plus the source files of each page so server.py can tell when a built page is
+older than its sources. Bundles are content-hashed, so they can be cached
+forever.
+
+Usage:
+    python build.py                      # every page in the project root
+    python build.py index.html hackathon.html --output /tmp/dist
+"""
+
+import argparse
+import glob
+import gzip
+import hashlib
+import json
+import os
+import re
+import shutil
+
+try:
+    import rjsmin
+except ImportError:  # optional: pip install rjsmin
+    rjsmin = None
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_OUTPUT = 'dist'
+ASSETS_DIR = 'assets'
+MANIFEST_FILE = 'manifest.json'
+REPORT_FILE = 'report.json'
+
+_WORD = re.compile(r'[A-Za-z_][\w-]*')
+_ATTR = re.compile(r'([\w:-]+)\s*=\s*("[^"]*"|\'[^\']*\'|[^\s>]+)')
+_LINK_TAG = re.compile(r'<link\b[^>]*>', re.I)
+_SCRIPT_TAG = re.compile(r'<script\b([^>]*)>\s*</script>', re.I)
+_RAW_BLOCK = re.compile(r'(<(script|style|pre|textarea)\b.*?</\2\s*>)', re.I | re.S)
+_HTML_COMMENT = re.compile(r'<!--(?!\[if).*?-->', re.S)
+
+
+# --- CSS -------------------------------------------------------------------
+
+def _skip_string(text: str, i: int) -> int:
+    """Index just past the quoted string starting at text[i]."""
+    quote = text[i]
+    i += 1
+    while i < len(text):
+        if text[i] == '\\':
+            i += 2
+            continue
+        if text[i] == quote:
+            return i + 1
+        i += 1
+    return i
+
+
+def minify_css(text: str) -> str:
+    """Strip comments and redundant whitespace, leaving strings untouched."""
+    out = []
+    i = 0
+    while i < len(text):
+        c = text[i]
+        if c in '"\'':
+            j = _skip_string(text, i)
+            out.append(text[i:j])
+            i = j
+        elif text.startswith('/*', i):
+            end = text.find('*/', i + 2)
+            i = len(text) if end == -1 else end + 2
+            out.append(' ')
+        elif c.isspace():
+            while i < len(text) and text[i].isspace():
+                i += 1
+            out.append(' ')
+        else:
+            out.append(c)
+            i += 1
+
+    css = ''.join(out)
+    # Re-split so the substitutions below never touch string contents
+    parts = re.split(r'("(?:\\.|[^"\\])*"|\'(?:\\.|[^\'\\])*\')', css)
+    for n in range(0, len(parts), 2):
+        part = re.sub(r'\s*([{};,>])\s*', r'\1', parts[n])
+        # Spaces before ":" are significant in selectors (".a :hover"), after it never
+        part = re.sub(r':\s+', ':', part)
+        parts[n] = part.replace(';}', '}')
+    return ''.join(parts).strip()
+
+
+def _block_end(css: str, start: int) -> int:
+    """Index of the "}" closing the block whose "{" is at css[start]."""
+    depth = 0
+    i = start
+    while i < len(css):
+        c = css[i]
+        if c in '"\'':
+            i = _skip_string(css, i)
+            continue
+        if c == '{':
+            depth += 1
+        elif c == '}':
+            depth -= 1
+            if depth == 0:
+                return i
+        i += 1
+    return len(css)
+
+
+def parse_css(css: str):
+    """Split minified CSS into (prelude, body) blocks and bare statements.
+
+    Blocks are ``[prelude, body]`` where ``body`` is a list of child nodes for
+    conditional at-rules (@media, @supports, ...) and the raw text otherwise;
+    statements such as ``@import`` are kept as strings.
+    """
+    nodes = []
+    i = 0
+    while i < len(css):
+        j = i
+        while j < len(css) and css[j] not in '{;':
+            j = _skip_string(css, j) if css[j] in '"\'' else j + 1
+        if j >= len(css) or css[j] == ';':
+            statement = css[i:j + 1].strip()
+            if statement and statement != ';':
+                nodes.append(statement)
+            i = j + 1
+            continue
+        end = _block_end(css, j)
+        prelude, body = css[i:j].strip(), css[j + 1:end]
+        if re.match(r'@(media|supports|layer|container|document)\b', prelude):
+            body = parse_css(body)
+        nodes.append([prelude, body])
+        i = end + 1
+    return nodes
+
+
+def serialize_css(nodes) -> str:
+    out = []
+    for node in nodes:
+        if isinstance(node, str):
+            out.append(node)
+            continue
+        prelude, body = node
+        if isinstance(body, list):
+            body = serialize_css(body)
+            if not body:
+                continue
+        out.append(f'{prelude}{{{body}}}')
+    return ''.join(out)
+
+
+def _strip_functional(selector: str) -> str:
+    """Drop attribute selectors and arguments of :not()/:is()/:where()/:has()."""
+    selector = re.sub(r'\[[^\]]*\]', '', selector)
+    while True:
+        match = re.search(r':(not|is|where|has)\(', selector)
+        if not match:
+            return selector
+        depth, i = 0, match.end() - 1
+        while i < len(selector):
+            if selector[i] == '(':
+                depth += 1
+            elif selector[i] == ')':
+                depth -= 1
+                if depth == 0:
+                    break
+            i += 1
+        selector = selector[:match.start()] + selector[i + 1:]
+
+
+def selector_names(selector: str) -> set:
+    """Class and id names a selector requires in the document."""
+    return set(re.findall(r'[.#](-?[A-Za-z_][\w-]*)', _strip_functional(selector)))
+
+
+def split_selectors(prelude: str):
+    parts, depth, start = [], 0, 0
+    for i, c in enumerate(prelude):
+        if c in '([':
+            depth += 1
+        elif c in ')]':
+            depth -= 1
+        elif c == ',' and depth == 0:
+            parts.append(prelude[start:i])
+            start = i + 1
+    parts.append(prelude[start:])
+    return parts
+
+
+def purge_css(nodes, names: set, keep_keyframes: bool = True):
+    """Keep only selectors whose classes/ids are all in ``names``."""
+    kept = []
+    for node in nodes:
+        if isinstance(node, str):
+            kept.append(node)
+            continue
+        prelude, body = node
+        if isinstance(body, list):
+            children = purge_css(body, names, keep_keyframes)
+            if children:
+                kept.append([prelude, children])
+        elif prelude.startswith('@'):
+            if keep_keyframes or not re.match(r'@(-\w+-)?keyframes\b', prelude):
+                kept.append(node)
+        else:
+            selectors = [s for s in split_selectors(prelude) if selector_names(s) <= names]
+            if selectors:
+                kept.append([','.join(selectors), body])
+    return kept
+
+
+def used_keyframes(nodes, css: str):
+    """@keyframes blocks whose name is referenced in ``css``."""
+    found = []
+    for node in nodes:
+        if isinstance(node, str):
+            continue
+        prelude, body = node
+        if isinstance(body, list):
+            found += used_keyframes(body, css)
+            continue
+        match = re.match(r'@(?:-\w+-)?keyframes\s*(\S+)', prelude)
+        if match and re.search(r'[:\s,]%s\b' % re.escape(match.group(1)), css):
+            found.append(node)
+    return found
+
+
+def absolutize_urls(css: str, base: str) -> str:
+    """Rewrite relative url() references so they survive the move to /assets/."""
+    def replace(match):
+        quote, url = match.group(1), match.group(2)
+        if re.match(r'([a-z]+:|/|#)', url, re.I):
+            return match.group(0)
+        return f'url({quote}/{os.path.normpath(os.path.join(base, url)).replace(os.sep, "/")}{quote})'
+    return re.sub(r'url\(\s*(["\']?)([^"\')]+)\1\s*\)', replace, css)
+
+
+# --- JS --------------------------------------------------------------------
+
+# After these, "/" starts a regular expression literal rather than a division
+_REGEX_PREFIX_CHARS = set('(,=:[!&|?{};+-*%<>~^')
+_REGEX_PREFIX_WORDS = {'return', 'typeof', 'case', 'do', 'else', 'in', 'of', 'delete', 'void', 'throw', 'new'}
+
+
+def _skip_template(source: str, i: int) -> int:
+    """Index just past the template literal starting at source[i], including ${...}."""
+    i += 1
+    while i < len(source):
+        c = source[i]
+        if c == '\\':
+            i += 2
+            continue
+        if c == '`':
+            return i + 1
+        if source.startswith('${', i):
+            depth, i = 1, i + 2
+            while i < len(source) and depth:
+                c = source[i]
+                if c in '"\'':
+                    i = _skip_string(source, i)
+                    continue
+                if c == '`':
+                    i = _skip_template(source, i)
+                    continue
+                depth += {'{': 1, '}': -1}.get(c, 0)
+                i += 1
+            continue
+        i += 1
+    return i
+
+
+def _skip_regex(source: str, i: int) -> int:
+    i += 1
+    in_class = False
+    while i < len(source) and source[i] != '\n':
+        c = source[i]
+        if c == '\\':
+            i += 2
+            continue
+        if c == '[':
+            in_class = True
+        elif c == ']':
+            in_class = False
+        elif c == '/' and not in_class:
+            i += 1
+            while i < len(source) and (source[i].isalnum() or source[i] == '_'):
+                i += 1
+            return i
+        i += 1
+    return i
+
+
+def strip_js(source: str) -> str:
+    """Remove comments and indentation; line breaks are kept so ASI is unchanged."""
+    out = []
+    last_char, last_word = '', ''
+    i = 0
+    while i < len(source):
+        c = source[i]
+        if c in '"\'`':
+            j = _skip_template(source, i) if c == '`' else _skip_string(source, i)
+            out.append(source[i:j])
+            last_char, last_word, i = c, '', j
+        elif source.startswith('//', i):
+            end = source.find('\n', i)
+            i = len(source) if end == -1 else end
+        elif source.startswith('/*', i):
+            end = source.find('*/', i + 2)
+            i = len(source) if end == -1 else end + 2
+            out.append(' ')
+        elif c == '/' and (not last_char or last_char in _REGEX_PREFIX_CHARS or last_word in _REGEX_PREFIX_WORDS):
+            j = _skip_regex(source, i)
+            out.append(source[i:j])
+            last_char, last_word, i = '/', '', j
+        elif c.isspace():
+            j = i
+            while j < len(source) and source[j].isspace():
+                j += 1
+            out.append('\n' if '\n' in source[i:j] else ' ')
+            i = j
+        elif c.isalnum() or c in '_$':
+            j = i
+            while j < len(source) and (source[j].isalnum() or source[j] in '_$'):
+                j += 1
+            last_word = source[i:j]
+            last_char = source[j - 1]
+            out.append(last_word)
+            i = j
+        else:
+            out.append(c)
+            last_char, last_word = c, ''
+            i += 1
+    return re.sub(r' ?\n[ \n]*', '\n', ''.join(out)).strip()
+
+
+def minify_js(source: str) -> str:
+    if rjsmin is not None:
+        return rjsmin.jsmin(source)
+    return strip_js(source)
+
+
+# --- HTML ------------------------------------------------------------------
+
+def tag_attrs(tag: str) -> dict:
+    return {name.lower(): value.strip('"\'') for name, value in _ATTR.findall(tag)}
+
+
+def is_local(url: str) -> bool:
+    return bool(url) and not re.match(r'([a-z]+:)?//|[a-z]+:', url, re.I)
+
+
+def minify_html(html: str) -> str:
+    """Drop comments and indentation outside <script>/<style>/<pre>/<textarea>."""
+    parts = _RAW_BLOCK.split(html)
+    out = []
+    # split() yields text, raw block, tag name, text, ...
+    for n in range(0, len(parts), 3):
+        text = _HTML_COMMENT.sub('', parts[n])
+        out.append(re.sub(r'\s*\n\s*', '\n', text))
+        if n + 1 < len(parts):
+            out.append(parts[n + 1])
+    return ''.join(out).strip() + '\n'
+
+
+def above_the_fold(html: str) -> str:
+    """Markup up to the end of the first <section> (header, nav and hero)."""
+    end = re.search(r'</section\s*>', html, re.I)
+    return html[:end.end()] if end else html
+
+
+def markup_names(html: str) -> set:
+    """Class and id names used in the markup."""
+    names = set()
+    for match in re.finditer(r'\b(class|id)\s*=\s*("[^"]*"|\'[^\']*\')', html, re.I):
+        names.update(match.group(2).strip('"\'').split())
+    return names
+
+
+def read(path: str) -> str:
+    with open(path, encoding='utf-8') as f:
+        return f.read()
+
+
+def weight(*bodies: str) -> dict:
+    data = ''.join(bodies).encode('utf-8')
+    return {'bytes': len(data), 'gzip': len(gzip.compress(data, compresslevel=9, mtime=0))}
+
+
+def write_asset(output: str, stem: str, ext: str, body: str, written: dict) -> str:
+    """Write a content-hashed bundle; pages with identical bundles share one file."""
+    digest = hashlib.sha256(body.encode('utf-8')).hexdigest()[:10]
+    if (digest, ext) in written:
+        return written[digest, ext]
+    name = f'{ASSETS_DIR}/{stem}.{digest}.{ext}'
+    with open(os.path.join(output, name), 'w', encoding='utf-8', newline='\n') as f:
+        f.write(body)
+    written[digest, ext] = '/' + name
+    return written[digest, ext]
+
+
+def build_page(page: str, output: str, written: dict) -> dict:
+    """Build one page; returns its manifest entry (with the weight report)."""
+    html = read(os.path.join(ROOT, page))
+    stem = os.path.splitext(page)[0]
+
+    stylesheets, scripts = [], []
+    for tag in _LINK_TAG.findall(html):
+        attrs = tag_attrs(tag)
+        if attrs.get('rel', '').lower() == 'stylesheet' and is_local(attrs.get('href')):
+            stylesheets.append((tag, attrs['href']))
+    for match in _SCRIPT_TAG.finditer(html):
+        attrs = tag_attrs(match.group(1))
+        if is_local(attrs.get('src')):
+            scripts.append((match.group(0), attrs['src']))
+
+    css_sources = [read(os.path.join(ROOT, href)) for _, href in stylesheets]
+    js_sources = [read(os.path.join(ROOT, src)) for _, src in scripts]
+    before = weight(html, *css_sources, *js_sources)
+
+    preloads = []
+    critical_css = ''
+    if stylesheets:
+        css = ''.join(absolutize_urls(minify_css(source), os.path.dirname(href))
+                      for source, (_, href) in zip(css_sources, stylesheets))
+        nodes = parse_css(css)
+        # Any word in the page or its scripts may be a class name (classList.add('open'), templates, ...)
+        page_words = set(_WORD.findall(html)) | set(_WORD.findall(''.join(js_sources)))
+        bundle = serialize_css(purge_css(nodes, page_words))
+        critical = purge_css(nodes, markup_names(above_the_fold(html)), keep_keyframes=False)
+        critical_css = serialize_css(critical)
+        critical_css += serialize_css(used_keyframes(nodes, critical_css))
+        href = write_asset(output, stem, 'css', bundle, written)
+        preloads.append((href, 'style'))
+
+        replacement = (
+            f'<style>{critical_css}</style>\n'
+            f'<link rel="preload" href="{href}" as="style" onload="this.onload=null;this.rel=\'stylesheet\'">\n'
+            f'<noscript><link rel="stylesheet" href="{href}"></noscript>'
+        )
+        html = html.replace(stylesheets[0][0], replacement, 1)
+        for tag, _ in stylesheets[1:]:
+            html = html.replace(tag, '', 1)
+    else:
+        bundle = ''
+
+    script_bundle = ''
+    if scripts:
+        # ";" keeps a file without a trailing semicolon from merging with the next one
+        script_bundle = ';\n'.join(minify_js(source) for source in js_sources) + ';\n'
+        src = write_asset(output, stem, 'js', script_bundle, written)
+        preloads.append((src, 'script'))
+        html = html.replace(scripts[0][0], f'<script src="{src}"></script>', 1)
+        for tag, _ in scripts[1:]:
+            html = html.replace(tag, '', 1)
+
+    if preloads:
+        hints = ''.join(f'<link rel="preload" href="{href}" as="{kind}">\n' for href, kind in preloads)
+        html = re.sub(r'(<head\b[^>]*>)', lambda m: m.group(1) + '\n' + hints, html, count=1, flags=re.I)
+
+    html = minify_html(html)
+    with open(os.path.join(output, page), 'w', encoding='utf-8', newline='\n') as f:
+        f.write(html)
+
+    return {
+        'link': ', '.join(f'<{href}>; rel=preload; as={kind}' for href, kind in preloads),
+        'before': before,
+        'after': weight(html, bundle, script_bundle),
+        'critical_css': len(critical_css.encode('utf-8')),
+        'sources': [page] + [href for _, href in stylesheets] + [src for _, src in scripts],
+    }
+
+
+def print_report(pages: dict) -> None:
+    print(f"{'página':<34} {'antes':>9} {'gzip':>8} │ {'depois':>9} {'gzip':>8} │ {'redução gzip':>12}")
+    totals = {'before': 0, 'after': 0}
+    for page, entry in pages.items():
+        before, after = entry['before'], entry['after']
+        totals['before'] += before['gzip']
+        totals['after'] += after['gzip']
+        saved = 1 - after['gzip'] / before['gzip'] if before['gzip'] else 0
+        print(f"{page:<34} {before['bytes']:>9} {before['gzip']:>8} │ "
+              f"{after['bytes']:>9} {after['gzip']:>8} │ {saved:>11.0%}")
+    if totals['before']:
+        print(f"\nTotal gzip: {totals['before']} -> {totals['after']} bytes "
+              f"({1 - totals['after'] / totals['before']:.0%} menor)")
+
+
+def build(pages, output: str) -> dict:
+    if os.path.isdir(output):
+        shutil.rmtree(output)
+    os.makedirs(os.path.join(output, ASSETS_DIR))
+
+    manifest, written = {}, {}
+    for page in pages:
+        manifest[page] = build_page(page, output, written)
+
+    with open(os.path.join(output, MANIFEST_FILE), 'w', encoding='utf-8') as f:
+        json.dump({page: entry['link'] for page, entry in manifest.items() if entry['link']}, f, indent=2)
+    with open(os.path.join(output, REPORT_FILE), 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
+
+
+def load_manifest(output: str) -> dict:
+    """Page -> preload Link header value; empty when the site was not built."""
+    try:
+        with open(os.path.join(output, MANIFEST_FILE), encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def load_sources(output: str) -> dict:
+    """Page -> source files (relative to the project root) it was built from."""
+    try:
+        with open(os.path.join(output, REPORT_FILE), encoding='utf-8') as f:
+            return {page: entry.get('sources', [page]) for page, entry in json.load(f).items()}
+    except (OSError, ValueError, AttributeError):
+        return {}
+
+
+def stale_sources(output: str, page: str, sources=None) -> list:
+    """Sources edited after ``page`` was built; empty when the built copy is current."""
+    try:
+        built = os.path.getmtime(os.path.join(output, page))
+    except OSError:
+        return []
+    stale = []
+    for source in sources or [page]:
+        try:
+            if os.path.getmtime(os.path.join(ROOT, source)) > built:
+                stale.append(source)
+        except OSError:
+            continue
+    return stale
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('pages', nargs='*', help='Páginas a gerar (padrão: todos os .html da raiz)')
+    parser.add_argument('--output', default=os.path.join(ROOT, DEFAULT_OUTPUT))
+    args = parser.parse_args()
+
+    pages = args.pages or sorted(
+        os.path.basename(path) for path in glob.glob(os.path.join(ROOT, '*.html')) if os.path.getsize(path)
+    )
+    print_report(build(pages, args.output))
+    print(f"\nJS minificado com {'rjsmin' if rjsmin else 'o minificador interno'}; saída em {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,102 @@
+"""Event content (speakers and agenda) served from a single JSON source file.
+
+``data/evento.json`` is the source of truth for the speakers and the schedule.
+Each section is rendered to JSON once, gzip-compressed once and tagged with a
+strong ETag, so requests only pick the right pre-built body. The file is
+re-read automatically when its modification time changes (checked at most
+every ``check_interval`` seconds), and each section keeps its own ETag: editing
+the agenda does not invalidate cached speaker responses.
+"""
+
+import gzip
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+
+from flask import Response
+
+from responses import dumps, JSON_MIMETYPE
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CONTENT_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'evento.json')
+SECTIONS = ('speakers', 'agenda')
+# Browsers/CDNs may reuse a response for a minute and serve it stale while revalidating for a day
+CACHE_CONTROL = 'public, max-age=60, stale-while-revalidate=86400'
+
+
+class RenderedSection:
+    """Pre-serialized body of one section with its gzip variant and ETags."""
+
+    __slots__ = ('body', 'gzip_body', 'etag', 'gzip_etag')
+
+    def __init__(self, key: str, data):
+        self.body = dumps({key: data})
+        self.gzip_body = gzip.compress(self.body, compresslevel=9, mtime=0)
+        digest = hashlib.sha256(self.body).hexdigest()[:32]
+        self.etag = digest
+        # Different bytes on the wire need a different strong validator
+        self.gzip_etag = f'{digest}-gz'
+
+
+class ContentStore:
+    """Loads the content file and hot-reloads it when it changes on disk."""
+
+    def __init__(self, path: str = DEFAULT_CONTENT_FILE, check_interval: float = 2.0):
+        self.path = path
+        self.check_interval = check_interval
+        self._lock = threading.Lock()
+        self._sections = {}
+        self._mtime = None
+        self._next_check = 0.0
+
+    def get(self, section: str) -> RenderedSection:
+        """Return the rendered section, reloading the source file if it changed."""
+        now = time.monotonic()
+        if now >= self._next_check:
+            self._reload_if_changed(now)
+        return self._sections.get(section)
+
+    def load(self) -> None:
+        """Read and render the content file (raises on missing/invalid file)."""
+        mtime = os.stat(self.path).st_mtime_ns
+        with open(self.path, encoding='utf-8') as f:
+            content = json.load(f)
+        self._sections = {key: RenderedSection(key, content.get(key, [])) for key in SECTIONS}
+        self._mtime = mtime
+        logger.info(f"Event content loaded from {self.path}")
+
+    def _reload_if_changed(self, now: float) -> None:
+        with self._lock:
+            if now < self._next_check:
+                return
+            self._next_check = now + self.check_interval
+            try:
+                if os.stat(self.path).st_mtime_ns != self._mtime:
+                    self.load()
+            except Exception as e:
+                # Keep serving the last good version while the file is being edited
+                logger.error(f"Failed to load event content from {self.path}: {e}")
+
+
+def section_response(section: RenderedSection, request) -> Response:
+    """Build a conditional, content-negotiated response for a rendered section."""
+    # Quality lookup, so 'gzip;q=0' (explicitly refused) falls back to identity
+    use_gzip = request.accept_encodings['gzip'] > 0
+    etag = section.gzip_etag if use_gzip else section.etag
+
+    if request.if_none_match.contains(section.etag) or request.if_none_match.contains(section.gzip_etag):
+        response = Response(status=304)
+    elif use_gzip:
+        response = Response(section.gzip_body, mimetype=JSON_MIMETYPE)
+        response.headers['Content-Encoding'] = 'gzip'
+    else:
+        response = Response(section.body, mimetype=JSON_MIMETYPE)
+
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = CACHE_CONTROL
+    response.headers['Vary'] = 'Accept-Encoding'
+    return response
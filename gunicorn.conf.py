@@ -0,0 +1,86 @@
+"""Gunicorn production profile for the Flask app (server.py).
+
+Gunicorn loads ./gunicorn.conf.py automatically, so ``gunicorn server:app``
+picks these settings up when started from the project root (render.yaml
+runs it there); options passed on the command line (such as ``--bind`` and
+``--timeout`` in render.yaml) still take precedence.
+
+The API spends most of its time waiting on Supabase over HTTP, so each worker
+runs several threads (gthread) instead of relying on one sync worker per
+request. Every knob can be overridden through environment variables:
+
+- WEB_CONCURRENCY        number of worker processes
+- GUNICORN_MAX_WORKERS   upper bound for the automatic worker count (default 4)
+- GUNICORN_THREADS       threads per worker (default 8)
+- GUNICORN_TIMEOUT, GUNICORN_GRACEFUL_TIMEOUT, GUNICORN_KEEPALIVE
+- GUNICORN_MAX_REQUESTS, GUNICORN_MAX_REQUESTS_JITTER
+"""
+
+import gc
+import multiprocessing
+import os
+
+
+def _env_int(name: str, default: int) -> int:
+    value = os.getenv(name)
+    try:
+        return int(value) if value else default
+    except ValueError:
+        return default
+
+
+def default_workers(cpu_count: int, max_workers: int) -> int:
+    """2 x CPU + 1, capped so small instances do not run out of memory."""
+    return max(1, min(cpu_count * 2 + 1, max_workers))
+
+
+bind = f"0.0.0.0:{os.getenv('PORT', '8000')}"
+
+workers = _env_int(
+    'WEB_CONCURRENCY',
+    default_workers(multiprocessing.cpu_count(), _env_int('GUNICORN_MAX_WORKERS', 4)),
+)
+# Threads overlap the Supabase round trips inside each worker
+worker_class = 'gthread'
+threads = _env_int('GUNICORN_THREADS', 8)
+
+timeout = _env_int('GUNICORN_TIMEOUT', 120)
+graceful_timeout = _env_int('GUNICORN_GRACEFUL_TIMEOUT', 30)
+keepalive = _env_int('GUNICORN_KEEPALIVE', 5)
+
+# Recycle workers periodically; the jitter avoids restarting all of them at once
+max_requests = _env_int('GUNICORN_MAX_REQUESTS', 2000)
+max_requests_jitter = _env_int('GUNICORN_MAX_REQUESTS_JITTER', 200)
+
+# Import server.py once in the master so the event content and the constant
+# response bodies are built before forking and shared copy-on-write. Mutable
+# state (the hackathon index) is loaded per worker in post_fork instead.
+preload_app = True
+
+accesslog = '-'
+errorlog = '-'
+loglevel = os.getenv('GUNICORN_LOG_LEVEL', 'info')
+
+
+def when_ready(server):
+    """Freeze the read-only state built at import right before the workers are forked."""
+    # Move everything allocated so far out of the GC's reach: collections in the
+    # workers then stop touching (and copying) the pages inherited from the master
+    gc.collect()
+    gc.freeze()
+
+    server.log.info(
+        "Workers: %s x %s threads (%s), max_requests=%s+-%s",
+        workers, threads, worker_class, max_requests, max_requests_jitter,
+    )
+
+
+def post_fork(server, worker):
+    """Load per-worker state and start the e-mail job workers (JOBS_INPROCESS_WORKERS)."""
+    import jobs
+    import server as app_module
+
+    # Each worker (including ones recycled by max_requests) loads the current
+    # teams itself; a snapshot taken in the master at boot would go stale
+    app_module.warm_hackathon_index()
+    jobs.start_inprocess_workers()
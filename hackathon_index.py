@@ -0,0 +1,323 @@
+"""In-memory index of hackathon teams used to detect conflicts before hitting Supabase.
+
+`hackathon_inscricoes` stores the leader and the optional members in flat columns
+(`leader_email`, `member2_email`, `member3_email`), so answering "is this person
+already in a team?" in SQL means scanning several columns. This module keeps two
+inverted maps instead:
+
+- normalized e-mail -> team IDs
+- normalized team name -> team IDs
+
+The index is warmed from the table, updated on every successful insert and
+consulted before the database write. It is only a fast reject path: each
+worker process has its own copy, so the authoritative check is done by the
+constraints in ``hackathon_unique_constraints.sql`` (see :func:`constraint_conflicts`).
+"""
+
+import re
+import threading
+import unicodedata
+
+HACKATHON_TABLE = 'hackathon_inscricoes'
+EMAIL_FIELDS = ('leader_email', 'member2_email', 'member3_email')
+WARM_PAGE_SIZE = 1000
+# Migrated teams share this fake address; it never identifies a person
+PLACEHOLDER_EMAIL_DOMAIN = '@placeholder.com'
+
+# Unique indexes created by hackathon_unique_constraints.sql
+EMAIL_CONSTRAINT = 'hackathon_emails_pkey'
+TEAM_KEY_CONSTRAINT = 'hackathon_inscricoes_team_key_key'
+
+EMAIL_FIELD_LABELS = {
+    'leader_email': 'do líder',
+    'member2_email': 'do membro 2',
+    'member3_email': 'do membro 3',
+}
+
+
+def normalize_email(value) -> str:
+    """Lowercase and trim an e-mail address; returns '' for empty values."""
+    if not isinstance(value, str):
+        return ''
+    return value.strip().lower()
+
+
+_ACCENTS = re.compile(r'[\u0300-\u036f]')
+_SPACES = re.compile(r'[ \t\r\n\f\v]+')
+
+
+def normalize_team_name(value) -> str:
+    """Lowercase, strip accents and collapse whitespace so 'Equipe  São' == 'equipe sao'.
+
+    Same steps as ``hackathon_team_key()`` in hackathon_unique_constraints.sql
+    (NFKD, drop U+0300-U+036F, lower, collapse whitespace): keep them in sync.
+    """
+    if not isinstance(value, str):
+        return ''
+    without_accents = _ACCENTS.sub('', unicodedata.normalize('NFKD', value))
+    return _SPACES.sub(' ', without_accents.lower()).strip(' ')
+
+
+def team_emails(row) -> list:
+    """Return the distinct normalized e-mails of a team row, leader first (placeholders skipped)."""
+    emails = []
+    for field in EMAIL_FIELDS:
+        email = normalize_email(row.get(field))
+        if email.endswith(PLACEHOLDER_EMAIL_DOMAIN):
+            continue
+        if email and email not in emails:
+            emails.append(email)
+    return emails
+
+
+def sanitize_name(value) -> str:
+    """Display form of a team name (trimmed, inner whitespace collapsed)."""
+    if not isinstance(value, str):
+        return ''
+    return ' '.join(value.split())
+
+
+def _committed(ids):
+    """Filter out pending claim placeholders."""
+    return [team_id for team_id in ids if not isinstance(team_id, _PendingTeam)]
+
+
+def _discard(index, key, team_id):
+    """Remove ``team_id`` from ``index[key]``, dropping the key once empty."""
+    ids = index.get(key)
+    if ids is None:
+        return
+    ids.discard(team_id)
+    if not ids:
+        del index[key]
+
+
+class _PendingTeam:
+    """Placeholder kept in the index while a claimed team is being written."""
+
+    __slots__ = ('emails', 'name', 'display_name')
+
+    def __init__(self, emails, name, display_name=''):
+        self.emails = emails
+        self.name = name
+        self.display_name = display_name
+
+    def __repr__(self):
+        return '<pending>'
+
+
+class HackathonTeamIndex:
+    """Thread-safe inverted index from e-mail / team name to team IDs."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._by_email = {}
+        self._by_team_name = {}
+        self._team_names = {}
+        self.warmed = False
+
+    # ------------------------------------------------------------------
+    # Loading
+    # ------------------------------------------------------------------
+    def warm(self, supabase, page_size: int = WARM_PAGE_SIZE) -> int:
+        """Load every team from Supabase using keyset pagination on `id`.
+
+        Returns the number of rows indexed. Exceptions from Supabase propagate
+        so the caller can decide whether to retry later.
+        """
+        columns = 'id, team_name, ' + ', '.join(EMAIL_FIELDS)
+        rows = []
+        last_id = 0
+        while True:
+            result = (
+                supabase.table(HACKATHON_TABLE)
+                .select(columns)
+                .gt('id', last_id)
+                .order('id')
+                .limit(page_size)
+                .execute()
+            )
+            page = result.data or []
+            rows.extend(page)
+            if len(page) < page_size:
+                break
+            last_id = page[-1]['id']
+
+        self.load(rows)
+        return len(rows)
+
+    def load(self, rows) -> None:
+        """Replace the index contents with the given team rows."""
+        by_email = {}
+        by_team_name = {}
+        team_names = {}
+        for row in rows:
+            team_id = row.get('id')
+            if team_id is None:
+                continue
+            name = normalize_team_name(row.get('team_name'))
+            if name:
+                by_team_name.setdefault(name, set()).add(team_id)
+                team_names[team_id] = sanitize_name(row.get('team_name'))
+            for email in team_emails(row):
+                by_email.setdefault(email, set()).add(team_id)
+
+        with self._lock:
+            self._by_email = by_email
+            self._by_team_name = by_team_name
+            self._team_names = team_names
+            self.warmed = True
+
+    # ------------------------------------------------------------------
+    # Write path
+    # ------------------------------------------------------------------
+    def claim(self, payload):
+        """Atomically check a new team and reserve its e-mails and name.
+
+        Returns ``(conflicts, token)``. When ``conflicts`` is non-empty nothing
+        was reserved and ``token`` is None. Otherwise the caller must later call
+        :meth:`commit` with the inserted ID or :meth:`release` on failure.
+        """
+        with self._lock:
+            conflicts = self._conflicts_locked(payload)
+            if conflicts:
+                return conflicts, None
+            token = _PendingTeam(
+                team_emails(payload),
+                normalize_team_name(payload.get('team_name')),
+                sanitize_name(payload.get('team_name')),
+            )
+            self._add_locked(token, payload)
+            return [], token
+
+    def commit(self, token, team_id) -> None:
+        """Swap a claim placeholder for the team ID returned by Supabase.
+
+        The placeholder may be gone if the index was reloaded meanwhile, so the
+        team is (re-)added from the token either way.
+        """
+        with self._lock:
+            keys = [(self._by_email, email) for email in token.emails]
+            if token.name:
+                keys.append((self._by_team_name, token.name))
+                self._team_names.pop(token, None)
+                self._team_names[team_id] = token.display_name
+            for index, key in keys:
+                ids = index.setdefault(key, set())
+                ids.discard(token)
+                ids.add(team_id)
+
+    def release(self, token) -> None:
+        """Drop a claim whose insert failed."""
+        if token is None:
+            return
+        with self._lock:
+            for email in token.emails:
+                _discard(self._by_email, email, token)
+            if token.name:
+                _discard(self._by_team_name, token.name, token)
+            self._team_names.pop(token, None)
+
+    # ------------------------------------------------------------------
+    # Reporting
+    # ------------------------------------------------------------------
+    def report(self) -> dict:
+        """Return every e-mail in more than one team and every duplicated team name."""
+        with self._lock:
+            duplicated_emails = [
+                {'email': email, 'team_ids': sorted(_committed(ids)), 'teams': self._names_for(ids)}
+                for email, ids in self._by_email.items()
+                if len(_committed(ids)) > 1
+            ]
+            duplicated_names = [
+                {'team_name': self._names_for(ids)[0], 'team_ids': sorted(_committed(ids))}
+                for name, ids in self._by_team_name.items()
+                if len(_committed(ids)) > 1
+            ]
+            total_teams = len(_committed(self._team_names.keys()))
+
+        duplicated_emails.sort(key=lambda item: item['email'])
+        duplicated_names.sort(key=lambda item: item['team_name'].casefold())
+        return {
+            'total_teams': total_teams,
+            'duplicated_emails': duplicated_emails,
+            'duplicated_team_names': duplicated_names,
+        }
+
+    # ------------------------------------------------------------------
+    # Internals (caller holds the lock)
+    # ------------------------------------------------------------------
+    def _conflicts_locked(self, payload) -> list:
+        conflicts = []
+        seen = set()
+        for field in EMAIL_FIELDS:
+            email = normalize_email(payload.get(field))
+            if not email or email.endswith(PLACEHOLDER_EMAIL_DOMAIN):
+                continue
+            if email in seen:
+                conflicts.append({'type': 'email_repetido', 'field': field, 'email': email})
+                continue
+            seen.add(email)
+            ids = self._by_email.get(email)
+            if ids:
+                conflicts.append({
+                    'type': 'email_em_outra_equipe',
+                    'field': field,
+                    'email': email,
+                    'team_ids': sorted(_committed(ids)),
+                })
+
+        name = normalize_team_name(payload.get('team_name'))
+        ids = self._by_team_name.get(name) if name else None
+        if ids:
+            conflicts.append({
+                'type': 'nome_de_equipe_em_uso',
+                'field': 'team_name',
+                'team_name': payload.get('team_name'),
+                'team_ids': sorted(_committed(ids)),
+            })
+        return conflicts
+
+    def _add_locked(self, team_id, payload) -> None:
+        name = normalize_team_name(payload.get('team_name'))
+        if name:
+            self._by_team_name.setdefault(name, set()).add(team_id)
+            self._team_names[team_id] = sanitize_name(payload.get('team_name'))
+        for email in team_emails(payload):
+            self._by_email.setdefault(email, set()).add(team_id)
+
+    def _names_for(self, ids) -> list:
+        return [self._team_names.get(team_id, '') for team_id in sorted(_committed(ids))]
+
+
+def constraint_conflicts(error) -> list:
+    """Map a unique violation raised by the database to conflicts ([] for other errors)."""
+    error_str = str(error)
+    if 'duplicate key value violates unique constraint' not in error_str.lower():
+        return []
+    if EMAIL_CONSTRAINT in error_str:
+        return [{'type': 'email_em_outra_equipe', 'field': None}]
+    if TEAM_KEY_CONSTRAINT in error_str:
+        return [{'type': 'nome_de_equipe_em_uso', 'field': 'team_name'}]
+    return []
+
+
+def describe_conflicts(conflicts) -> str:
+    """Build a user-facing Portuguese message for the first conflicts found.
+
+    Only the form field is named, never other teams or their members.
+    """
+    messages = []
+    for conflict in conflicts:
+        kind = conflict['type']
+        label = EMAIL_FIELD_LABELS.get(conflict.get('field'))
+        if kind == 'email_em_outra_equipe':
+            if label:
+                messages.append(f"O e-mail {label} já está inscrito em outra equipe.")
+            else:
+                messages.append('Um dos e-mails informados já está inscrito em outra equipe.')
+        elif kind == 'email_repetido':
+            messages.append(f"O e-mail {label} repete outro e-mail da equipe.")
+        elif kind == 'nome_de_equipe_em_uso':
+            messages.append('Já existe uma equipe inscrita com este nome.')
+    return ' '.join(messages)
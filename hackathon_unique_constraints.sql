@@ -0,0 +1,114 @@
+-- ============================================================
+-- UNICIDADE DE E-MAILS E NOMES DE EQUIPE DO HACKATHON
+-- ============================================================
+-- Execute este script no SQL Editor do Supabase (pode ser
+-- executado mais de uma vez).
+--
+-- O índice em memória do servidor (hackathon_index.py) rejeita
+-- conflitos rapidamente, mas cada worker do Gunicorn tem a sua
+-- cópia. Estas restrições garantem no banco que:
+--   * uma pessoa (e-mail) está em no máximo uma equipe;
+--   * dois nomes de equipe iguais (ignorando maiúsculas, acentos
+--     e espaços) não coexistem.
+-- O servidor reconhece as violações abaixo pelo nome e responde 409.
+--
+-- Obrigatório antes do deploy: sem este script o servidor continua
+-- funcionando, mas a unicidade vale só dentro de cada worker.
+-- ============================================================
+
+-- PASSO 1: Chave normalizada do nome da equipe
+-- ============================================================
+-- Calculada só aqui, pelo trigger (o servidor não envia team_key).
+-- Mesmos passos de normalize_team_name() em hackathon_index.py:
+-- NFKD, remove acentos (U+0300 a U+036F), minúsculas e espaços
+-- colapsados. Mantenha os dois iguais. Requer Postgres 13+.
+ALTER TABLE hackathon_inscricoes ADD COLUMN IF NOT EXISTS team_key VARCHAR;
+
+CREATE OR REPLACE FUNCTION hackathon_team_key(name TEXT)
+RETURNS TEXT AS $$
+    SELECT NULLIF(btrim(regexp_replace(
+        lower(regexp_replace(normalize(COALESCE(name, ''), NFKD), '[\u0300-\u036F]', '', 'g')),
+        '[ \t\r\n\f\v]+', ' ', 'g'
+    ), ' '), '');
+$$ LANGUAGE sql IMMUTABLE;
+
+CREATE OR REPLACE FUNCTION hackathon_fill_team_key()
+RETURNS TRIGGER AS $$
+BEGIN
+    NEW.team_key := hackathon_team_key(NEW.team_name);
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS hackathon_fill_team_key_trigger ON hackathon_inscricoes;
+CREATE TRIGGER hackathon_fill_team_key_trigger
+BEFORE INSERT OR UPDATE OF team_name ON hackathon_inscricoes
+FOR EACH ROW
+EXECUTE FUNCTION hackathon_fill_team_key();
+
+-- Recalcula todas as linhas (o script pode ser executado de novo
+-- após mudar a normalização). Nomes já repetidos recebem o id
+-- como sufixo para o índice poder ser criado; eles continuam
+-- aparecendo em GET /api/hackathon/conflitos.
+DROP INDEX IF EXISTS hackathon_inscricoes_team_key_key;
+
+UPDATE hackathon_inscricoes SET team_key = hackathon_team_key(team_name);
+
+UPDATE hackathon_inscricoes h
+SET team_key = h.team_key || '#' || h.id
+FROM hackathon_inscricoes o
+WHERE o.team_key = h.team_key AND o.id < h.id;
+
+CREATE UNIQUE INDEX IF NOT EXISTS hackathon_inscricoes_team_key_key ON hackathon_inscricoes(team_key);
+
+-- PASSO 2: Um e-mail por equipe
+-- ============================================================
+-- Tabela auxiliar com um registro por e-mail (líder e membros),
+-- preenchida pelo trigger na mesma transação do INSERT: se algum
+-- e-mail já existir, a inscrição inteira é desfeita.
+CREATE TABLE IF NOT EXISTS hackathon_emails (
+    email VARCHAR PRIMARY KEY,
+    team_id INTEGER NOT NULL REFERENCES hackathon_inscricoes(id) ON DELETE CASCADE
+);
+
+-- Sem policies: a tabela não é legível pela chave anon
+ALTER TABLE hackathon_emails ENABLE ROW LEVEL SECURITY;
+
+CREATE OR REPLACE FUNCTION hackathon_register_emails()
+RETURNS TRIGGER AS $$
+BEGIN
+    INSERT INTO hackathon_emails (email, team_id)
+    SELECT DISTINCT lower(btrim(e)), NEW.id
+    FROM unnest(ARRAY[NEW.leader_email, NEW.member2_email, NEW.member3_email]) AS e
+    WHERE NULLIF(btrim(e), '') IS NOT NULL
+      AND lower(btrim(e)) NOT LIKE '%@placeholder.com';
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER SET search_path = public;
+
+DROP TRIGGER IF EXISTS hackathon_register_emails_trigger ON hackathon_inscricoes;
+CREATE TRIGGER hackathon_register_emails_trigger
+AFTER INSERT ON hackathon_inscricoes
+FOR EACH ROW
+EXECUTE FUNCTION hackathon_register_emails();
+
+-- Preenche com as equipes existentes (a primeira equipe de cada
+-- e-mail fica com ele; placeholders da migração são ignorados)
+INSERT INTO hackathon_emails (email, team_id)
+SELECT DISTINCT ON (email) email, id
+FROM (
+    SELECT id, lower(btrim(leader_email)) AS email FROM hackathon_inscricoes
+    UNION ALL
+    SELECT id, lower(btrim(member2_email)) FROM hackathon_inscricoes
+    UNION ALL
+    SELECT id, lower(btrim(member3_email)) FROM hackathon_inscricoes
+) AS emails
+WHERE email LIKE '%@%' AND email NOT LIKE '%@placeholder.com'
+ORDER BY email, id
+ON CONFLICT (email) DO NOTHING;
+
+-- PASSO 3: Verificar
+-- ============================================================
+SELECT
+    (SELECT count(*) FROM hackathon_inscricoes) AS equipes,
+    (SELECT count(*) FROM hackathon_emails) AS emails_registrados;
@@ -0,0 +1,540 @@
+"""Background jobs: confirmation e-mails sent outside the request path.
+
+Request handlers only call :func:`enqueue_confirmation_email`, which inserts a
+row into a local SQLite queue (WAL mode) and returns. Workers then:
+
+- take send tokens first and then claim at most that many jobs, so a leased
+  batch never waits on the rate limit (expired leases are reclaimed after a
+  crash),
+- send each batch over a single reused SMTP connection, to exactly one
+  validated recipient per job,
+- respect one send rate (``SMTP_RATE_PER_MINUTE``) across every thread and
+  process using the same ``JOBS_DB``: the token bucket lives in that database,
+- retry transient failures with exponential backoff and jitter, giving up after
+  ``JOBS_MAX_ATTEMPTS``; permanent SMTP errors (5xx) fail immediately.
+
+Workers run either inside the web process (``JOBS_INPROCESS_WORKERS`` > 0) or
+as a separate process on the same machine::
+
+    python jobs.py worker
+
+The queue is a local file, so a worker on another host (e.g. a separate Render
+service) never sees it: on Render the workers run in-process (render.yaml).
+``JOBS_DB`` defaults to ``~/.sanca-week/jobs.sqlite3``, outside the directory
+server.py serves, because finished jobs keep names and e-mails for 7 days.
+
+To test locally, point SMTP_HOST/SMTP_PORT at a sink such as
+``python -m aiosmtpd -n -l localhost:1025`` with SMTP_STARTTLS=0.
+"""
+
+import argparse
+import json
+import logging
+import os
+import random
+import re
+import smtplib
+import sqlite3
+import threading
+import time
+from email.message import EmailMessage
+from email.utils import getaddresses
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+# Holds names and e-mails: keep it out of the project root that server.py serves
+JOBS_DB = os.getenv('JOBS_DB') or os.path.join(os.path.expanduser('~'), '.sanca-week', 'jobs.sqlite3')
+CONTENT_FILE = os.getenv('CONTENT_FILE') or os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'evento.json')
+
+SMTP_HOST = os.getenv('SMTP_HOST')
+SMTP_PORT = int(os.getenv('SMTP_PORT') or 587)
+SMTP_USER = os.getenv('SMTP_USER')
+SMTP_PASSWORD = os.getenv('SMTP_PASSWORD')
+SMTP_STARTTLS = os.getenv('SMTP_STARTTLS', '1') == '1'
+SMTP_SSL = os.getenv('SMTP_SSL', '0') == '1'
+MAIL_FROM = os.getenv('MAIL_FROM') or SMTP_USER or 'no-reply@localhost'
+SMTP_RATE_PER_MINUTE = float(os.getenv('SMTP_RATE_PER_MINUTE') or 60)
+
+BATCH_SIZE = int(os.getenv('JOBS_BATCH_SIZE') or 20)
+MAX_ATTEMPTS = int(os.getenv('JOBS_MAX_ATTEMPTS') or 6)
+LEASE_SECONDS = 300
+BACKOFF_BASE = 30
+BACKOFF_MAX = 3600
+POLL_INTERVAL = 2.0
+KEEP_DONE_SECONDS = 7 * 24 * 3600
+
+# Confirmation e-mail data per event: display name, page used to find the slot
+# in data/evento.json and the WhatsApp group shown on the confirmation page
+EVENTS = {
+    'sanca-week': {
+        'name': 'V SANCA Week',
+        'page': None,
+        'whatsapp': 'https://chat.whatsapp.com/KXnaFHCxrlqGI517qt5JLF',
+    },
+    'hackathon': {
+        'name': 'CS Challenge',
+        'page': 'hackathon.html',
+        'whatsapp': 'https://chat.whatsapp.com/IR6CZvV8h7BIxwDJh0Z7Hz',
+    },
+    'minicurso-fibra': {
+        'name': 'Minicurso de Fibra Ótica',
+        'page': 'minicurso-fibra.html',
+        'whatsapp': 'https://chat.whatsapp.com/BwQwQkUYZM88S5d3iLMCR3',
+    },
+    'minicurso-quantica': {
+        'name': 'Minicurso de Computação Quântica',
+        'page': 'minicurso-quantica.html',
+        'whatsapp': 'https://chat.whatsapp.com/DKztKt2nxjmJRetikggSdX',
+    },
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY,
+    kind TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    run_at REAL NOT NULL,
+    locked_until REAL,
+    last_error TEXT,
+    created_at REAL NOT NULL,
+    finished_at REAL
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_ready ON jobs(status, run_at);
+CREATE TABLE IF NOT EXISTS rate_limits (
+    name TEXT PRIMARY KEY,
+    tokens REAL NOT NULL,
+    updated REAL NOT NULL
+);
+"""
+
+# A plain local@domain address: no display name, lists, comments or whitespace
+_ADDRESS = re.compile(r'^[A-Za-z0-9.!#$%&\'*+/=?^_`{|}~-]+@[A-Za-z0-9](?:[A-Za-z0-9-]*[A-Za-z0-9])?(?:\.[A-Za-z0-9](?:[A-Za-z0-9-]*[A-Za-z0-9])?)+$')
+
+
+def mail_enabled() -> bool:
+    return bool(SMTP_HOST)
+
+
+def single_address(value) -> str:
+    """Return the one plain e-mail address in ``value``, or None.
+
+    Rejects address lists ("a@x.com, b@y.com"), display names, CR/LF and
+    anything else that could make a confirmation reach more than one mailbox.
+    """
+    if not isinstance(value, str) or '\r' in value or '\n' in value:
+        return None
+    value = value.strip()
+    addresses = getaddresses([value])
+    if len(addresses) != 1:
+        return None
+    name, address = addresses[0]
+    if name or address != value or not _ADDRESS.match(address):
+        return None
+    return address
+
+
+class PermanentJobError(Exception):
+    """Failure that retrying will not fix (e.g. recipient rejected)."""
+
+
+class JobQueue:
+    """Persistent job queue on SQLite, safe to share between threads and processes."""
+
+    def __init__(self, path: str = JOBS_DB):
+        self.path = path
+        self._local = threading.local()
+        self.wakeup = threading.Event()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        conn = self._connect()
+        try:
+            conn.executescript(SCHEMA)
+        finally:
+            conn.close()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=NORMAL')
+        return conn
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        # One connection per thread and per process (gunicorn forks after preload)
+        pid = os.getpid()
+        if getattr(self._local, 'pid', None) != pid:
+            self._local.conn = self._connect()
+            self._local.pid = pid
+        return self._local.conn
+
+    def enqueue(self, kind: str, payload: dict, delay: float = 0.0) -> int:
+        now = time.time()
+        cursor = self.conn.execute(
+            'INSERT INTO jobs (kind, payload, run_at, created_at) VALUES (?, ?, ?, ?)',
+            (kind, json.dumps(payload, ensure_ascii=False), now + delay, now),
+        )
+        self.wakeup.set()
+        return cursor.lastrowid
+
+    def claim(self, limit: int = BATCH_SIZE):
+        """Lease up to ``limit`` ready jobs; returns ``[(id, kind, payload, attempts)]``."""
+        now = time.time()
+        conn = self.conn
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            rows = conn.execute(
+                "SELECT id, kind, payload, attempts FROM jobs "
+                "WHERE (status = 'pending' AND run_at <= ?) OR (status = 'running' AND locked_until <= ?) "
+                "ORDER BY run_at LIMIT ?",
+                (now, now, limit),
+            ).fetchall()
+            if rows:
+                conn.executemany(
+                    "UPDATE jobs SET status = 'running', locked_until = ? WHERE id = ?",
+                    [(now + LEASE_SECONDS, row[0]) for row in rows],
+                )
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+        return [(job_id, kind, json.loads(payload), attempts) for job_id, kind, payload, attempts in rows]
+
+    def renew(self, job_id: int) -> None:
+        """Extend the lease of a job that is about to be processed."""
+        self.conn.execute(
+            "UPDATE jobs SET locked_until = ? WHERE id = ? AND status = 'running'",
+            (time.time() + LEASE_SECONDS, job_id),
+        )
+
+    def complete(self, job_id: int) -> None:
+        self.conn.execute(
+            "UPDATE jobs SET status = 'done', finished_at = ?, locked_until = NULL WHERE id = ?",
+            (time.time(), job_id),
+        )
+
+    def fail(self, job_id: int, attempts: int, error: str, permanent: bool = False) -> None:
+        attempts += 1
+        if permanent or attempts >= MAX_ATTEMPTS:
+            self.conn.execute(
+                "UPDATE jobs SET status = 'failed', attempts = ?, last_error = ?, finished_at = ?, "
+                "locked_until = NULL WHERE id = ?",
+                (attempts, error[:500], time.time(), job_id),
+            )
+            logger.error(f"Job {job_id} failed permanently after {attempts} attempts: {error}")
+            return
+
+        delay = min(BACKOFF_MAX, BACKOFF_BASE * 2 ** (attempts - 1)) * random.uniform(0.8, 1.2)
+        self.conn.execute(
+            "UPDATE jobs SET status = 'pending', attempts = ?, last_error = ?, run_at = ?, "
+            "locked_until = NULL WHERE id = ?",
+            (attempts, error[:500], time.time() + delay, job_id),
+        )
+        logger.warning(f"Job {job_id} failed (attempt {attempts}), retrying in {delay:.0f}s: {error}")
+
+    def purge_done(self, older_than: float = KEEP_DONE_SECONDS) -> int:
+        cursor = self.conn.execute(
+            "DELETE FROM jobs WHERE status = 'done' AND finished_at < ?", (time.time() - older_than,)
+        )
+        return cursor.rowcount
+
+    def stats(self) -> dict:
+        return dict(self.conn.execute('SELECT status, COUNT(*) FROM jobs GROUP BY status').fetchall())
+
+
+class RateLimiter:
+    """Token bucket stored in the job database.
+
+    Every thread and process using the same ``JOBS_DB`` (in-process workers in
+    each gunicorn worker, ``python jobs.py worker``) draws from one bucket, so
+    the configured rate is the total rate.
+    """
+
+    def __init__(self, job_queue: JobQueue, per_minute: float, burst: int = 5, name: str = 'smtp'):
+        self.queue = job_queue
+        self.rate = per_minute / 60.0
+        self.capacity = max(1, burst)
+        self.name = name
+
+    def take(self, limit: int, stop: threading.Event = None) -> int:
+        """Block until at least one token is free, then take up to ``limit``; 0 if stopped."""
+        while True:
+            granted, wait = self._try_take(limit)
+            if granted:
+                return granted
+            if stop is None:
+                time.sleep(wait)
+            elif stop.wait(wait):
+                return 0
+
+    def give_back(self, count: int) -> None:
+        """Return tokens that were taken but not used (fewer jobs than expected)."""
+        if count > 0:
+            self.queue.conn.execute(
+                'UPDATE rate_limits SET tokens = MIN(?, tokens + ?) WHERE name = ?',
+                (self.capacity, count, self.name),
+            )
+
+    def _try_take(self, limit: int):
+        conn = self.queue.conn
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            now = time.time()
+            row = conn.execute('SELECT tokens, updated FROM rate_limits WHERE name = ?', (self.name,)).fetchone()
+            if row is None:
+                tokens = float(self.capacity)
+            else:
+                tokens = min(self.capacity, row[0] + max(0.0, now - row[1]) * self.rate)
+            granted = min(limit, int(tokens))
+            conn.execute(
+                'INSERT OR REPLACE INTO rate_limits (name, tokens, updated) VALUES (?, ?, ?)',
+                (self.name, tokens - granted, now),
+            )
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+        return granted, (1 - (tokens - granted)) / self.rate
+
+
+class Mailer:
+    """Keeps one SMTP connection open and reconnects when it drops."""
+
+    def __init__(self):
+        self._smtp = None
+
+    def _open(self):
+        if SMTP_SSL:
+            smtp = smtplib.SMTP_SSL(SMTP_HOST, SMTP_PORT, timeout=30)
+        else:
+            smtp = smtplib.SMTP(SMTP_HOST, SMTP_PORT, timeout=30)
+            if SMTP_STARTTLS:
+                smtp.starttls()
+        if SMTP_USER:
+            smtp.login(SMTP_USER, SMTP_PASSWORD or '')
+        return smtp
+
+    def send(self, message: EmailMessage, recipient: str) -> None:
+        for attempt in range(2):
+            if self._smtp is None:
+                self._smtp = self._open()
+            try:
+                # Explicit envelope recipient: never derived from the headers
+                self._smtp.send_message(message, to_addrs=[recipient])
+                return
+            except smtplib.SMTPServerDisconnected:
+                # Idle connection closed by the server: reconnect once
+                self._smtp = None
+                if attempt:
+                    raise
+            except smtplib.SMTPRecipientsRefused as e:
+                raise PermanentJobError(str(e))
+            except smtplib.SMTPResponseException as e:
+                if 500 <= e.smtp_code < 600:
+                    raise PermanentJobError(f'{e.smtp_code} {e.smtp_error!r}')
+                raise
+
+    def close(self) -> None:
+        if self._smtp is not None:
+            try:
+                self._smtp.quit()
+            except smtplib.SMTPException:
+                pass
+            self._smtp = None
+
+
+def _slot_for_page(page: str):
+    """Find the agenda slot that links to ``page`` in data/evento.json."""
+    if not page:
+        return None, None
+    try:
+        with open(CONTENT_FILE, encoding='utf-8') as f:
+            agenda = json.load(f).get('agenda', [])
+    except (OSError, ValueError):
+        return None, None
+    for day in agenda:
+        for slot in day.get('slots', []):
+            if slot.get('link') == page:
+                return day, slot
+    return None, None
+
+
+def build_confirmation_email(payload: dict) -> EmailMessage:
+    recipient = single_address(payload.get('email'))
+    if recipient is None:
+        raise PermanentJobError('invalid recipient address')
+    event = EVENTS[payload['event']]
+    day, slot = _slot_for_page(event['page'])
+
+    lines = [f"Olá, {payload.get('nome') or 'participante'}!", '', f"Sua inscrição no {event['name']} foi confirmada."]
+    if payload.get('team_name'):
+        lines.append(f"Equipe: {payload['team_name']}")
+    if slot:
+        lines += ['', f"Quando: {day['label']}, {slot['time']}"]
+        if slot.get('location'):
+            lines.append(f"Onde: {slot['location']}")
+    lines += [
+        '',
+        'Entre no grupo do WhatsApp para receber os avisos do evento:',
+        event['whatsapp'],
+        '',
+        'Ramo Estudantil IEEE USP São Carlos',
+    ]
+
+    message = EmailMessage()
+    message['From'] = MAIL_FROM
+    message['To'] = recipient
+    message['Subject'] = f"Inscrição confirmada: {event['name']}"
+    message.set_content('\n'.join(lines))
+    return message
+
+
+HANDLERS = {
+    'confirmation_email': build_confirmation_email,
+}
+
+
+class WorkerPool:
+    """Threads that claim batches of jobs and send them with a reused SMTP connection."""
+
+    def __init__(self, job_queue: JobQueue, size: int = 2, rate_per_minute: float = SMTP_RATE_PER_MINUTE):
+        self.queue = job_queue
+        self.size = size
+        self.limiter = RateLimiter(job_queue, rate_per_minute)
+        self._stop = threading.Event()
+        self._threads = []
+
+    def start(self) -> None:
+        for index in range(self.size):
+            thread = threading.Thread(target=self._run, name=f'jobs-worker-{index}', daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        logger.info(f"Job workers started: {self.size}")
+
+    def stop(self, timeout: float = 10.0) -> None:
+        self._stop.set()
+        self.queue.wakeup.set()
+        for thread in self._threads:
+            thread.join(timeout)
+
+    def _run(self) -> None:
+        mailer = Mailer()
+        next_purge = 0.0
+        try:
+            while not self._stop.is_set():
+                # Claim only as many jobs as there are send tokens, so no leased job
+                # waits on the rate limit and outlives its lease
+                batch = []
+                try:
+                    granted = self.limiter.take(BATCH_SIZE, self._stop)
+                    if not granted:
+                        continue
+                    batch = self.queue.claim(granted)
+                    self.limiter.give_back(granted - len(batch))
+                except sqlite3.Error as e:
+                    logger.error(f"Job queue error: {e}")
+
+                if not batch:
+                    # Close idle SMTP connections instead of letting the server time them out
+                    mailer.close()
+                    if time.monotonic() >= next_purge:
+                        self.queue.purge_done()
+                        next_purge = time.monotonic() + 3600
+                    self.queue.wakeup.wait(POLL_INTERVAL)
+                    self.queue.wakeup.clear()
+                    continue
+
+                for job_id, kind, payload, attempts in batch:
+                    self._process(mailer, job_id, kind, payload, attempts)
+        finally:
+            mailer.close()
+
+    def _process(self, mailer, job_id, kind, payload, attempts) -> None:
+        handler = HANDLERS.get(kind)
+        if handler is None:
+            self.queue.fail(job_id, attempts, f'unknown job kind {kind}', permanent=True)
+            return
+        try:
+            self.queue.renew(job_id)
+            message = handler(payload)
+            recipient = single_address(message['To'])
+            if recipient is None:
+                raise PermanentJobError('invalid recipient address')
+            mailer.send(message, recipient)
+            self.queue.complete(job_id)
+        except PermanentJobError as e:
+            self.queue.fail(job_id, attempts, str(e), permanent=True)
+        except Exception as e:
+            mailer.close()
+            self.queue.fail(job_id, attempts, f'{type(e).__name__}: {e}')
+
+
+_queue = None
+_queue_lock = threading.Lock()
+_pool = None
+
+
+def get_queue() -> JobQueue:
+    global _queue
+    if _queue is None:
+        with _queue_lock:
+            if _queue is None:
+                _queue = JobQueue()
+    return _queue
+
+
+def start_inprocess_workers() -> None:
+    """Start workers inside this process when JOBS_INPROCESS_WORKERS > 0 (call after fork)."""
+    global _pool
+    size = int(os.getenv('JOBS_INPROCESS_WORKERS') or 0)
+    if size <= 0 or not mail_enabled() or _pool is not None:
+        return
+    _pool = WorkerPool(get_queue(), size)
+    _pool.start()
+
+
+def enqueue_confirmation_email(event: str, email: str, nome: str = None, **extra) -> None:
+    """Queue a confirmation e-mail; never raises into the request handler."""
+    if not mail_enabled():
+        return
+    address = single_address(email)
+    if address is None:
+        if email:
+            logger.warning("Confirmation e-mail not queued: invalid recipient address")
+        return
+    try:
+        get_queue().enqueue('confirmation_email', {'event': event, 'email': address, 'nome': nome, **extra})
+    except Exception as e:
+        logger.error(f"Failed to enqueue confirmation e-mail: {e}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Background job worker')
+    sub = parser.add_subparsers(dest='command', required=True)
+    worker = sub.add_parser('worker', help='process jobs until interrupted')
+    worker.add_argument('--threads', type=int, default=int(os.getenv('JOBS_WORKERS') or 2))
+    sub.add_parser('stats', help='show job counts by status')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    if args.command == 'stats':
+        print(json.dumps(get_queue().stats()))
+        return
+
+    if not mail_enabled():
+        parser.error('SMTP_HOST não configurado')
+    pool = WorkerPool(get_queue(), args.threads)
+    pool.start()
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        pool.stop()
+
+
+if __name__ == '__main__':
+    main()
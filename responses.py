@@ -0,0 +1,62 @@
+"""JSON response helpers for the API hot path.
+
+- Constant bodies (validation errors, generic 500s...) are serialized once at
+  import and only wrapped in a fresh ``Response`` per request.
+- Dynamic bodies are encoded with ``orjson`` (a required dependency, see
+  requirements.txt).
+"""
+
+import orjson
+from flask import Response
+
+JSON_MIMETYPE = 'application/json'
+
+
+def dumps(obj) -> bytes:
+    """Serialize ``obj`` to compact UTF-8 JSON bytes."""
+    return orjson.dumps(obj)
+
+
+def json_response(obj, status: int = 200) -> Response:
+    """Drop-in replacement for ``jsonify(obj), status`` using the fast encoder."""
+    return Response(dumps(obj), status=status, mimetype=JSON_MIMETYPE)
+
+
+class StaticResponse:
+    """JSON body serialized once; ``response()`` only builds the Response wrapper."""
+
+    __slots__ = ('body', 'status')
+
+    def __init__(self, obj, status: int):
+        self.body = dumps(obj)
+        self.status = status
+
+    def response(self) -> Response:
+        # A new Response per request: flask-cors and Flask itself mutate headers
+        return Response(self.body, status=self.status, mimetype=JSON_MIMETYPE)
+
+
+def static_error(message: str, status: int) -> StaticResponse:
+    """Pre-serialized ``{'success': False, 'message': ...}`` body."""
+    return StaticResponse({'success': False, 'message': message}, status)
+
+
+# ----------------------------------------------------------------------
+# Constant bodies shared by the endpoints in server.py
+# ----------------------------------------------------------------------
+NO_DATA = static_error('Nenhum dado recebido', 400)
+VALIDATION_ERROR = static_error('Erro de validação', 400)
+ACCESS_DENIED = static_error('Acesso negado', 403)
+SAVE_ERROR = static_error('Erro ao salvar dados', 500)
+INTERNAL_ERROR = static_error('Erro interno do servidor', 500)
+DB_CONNECTION_ERROR = static_error('Erro de conexão com o banco de dados', 500)
+DB_CONNECTION_ERROR_SHORT = static_error('Erro de conexão com o banco', 500)
+SUPABASE_CONNECTION_ERROR = static_error('Erro de conexão com o Supabase', 500)
+FIBRA_MISSING_FIELDS = static_error('Informe nome completo e telefone.', 400)
+QUANTICA_MISSING_FIELDS = static_error('Informe nome completo, telefone e e-mail.', 400)
+SCHEMA_TEST_FAILED = static_error('Falha na inserção de teste', 500)
+CONTENT_UNAVAILABLE = static_error('Conteúdo do evento indisponível', 503)
+INDEX_NOT_FOUND = static_error('Arquivo index.html não encontrado', 404)
+NOT_FOUND = StaticResponse({'error': 'Not found'}, 404)
+HEALTHY = StaticResponse({'status': 'healthy', 'database': 'connected'}, 200)
+UNHEALTHY = StaticResponse({'status': 'unhealthy', 'database': 'disconnected'}, 500)
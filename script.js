@@ -369,26 +369,6 @@ window.addEventListener('scroll', () => {
     }
 });
 
-// Programação: Tabs switching
-document.addEventListener('DOMContentLoaded', () => {
-    const tabs = document.querySelectorAll('.tabs .tab');
-    const panels = document.querySelectorAll('.day-panel');
-    if (!tabs.length || !panels.length) return;
-
-    tabs.forEach(tab => {
-        tab.addEventListener('click', () => {
-            const targetId = tab.dataset.day;
-
-            tabs.forEach(t => t.classList.remove('active'));
-            tab.classList.add('active');
-
-            panels.forEach(p => p.classList.remove('active'));
-            const panel = document.getElementById(targetId);
-            if (panel) panel.classList.add('active');
-        });
-    });
-});
-
 // Animation on scroll
 const observerOptions = {
     threshold: 0.1,
@@ -1,11 +1,24 @@
-from flask import Flask, request, jsonify, send_from_directory, send_file, abort
+from flask import Flask, request, send_from_directory, abort
 from flask_cors import CORS
 from dotenv import load_dotenv
 import os
+import hmac
 from supabase import create_client, Client
 from datetime import datetime
 import logging
 import re
+from hackathon_index import HackathonTeamIndex, constraint_conflicts, describe_conflicts
+from content_store import ContentStore, DEFAULT_CONTENT_FILE, section_response
+from traffic_capture import init_traffic_capture
+from jobs import enqueue_confirmation_email, start_inprocess_workers
+from build import DEFAULT_OUTPUT, load_manifest, load_sources, stale_sources
+from responses import (
+    json_response,
+    NO_DATA, VALIDATION_ERROR, ACCESS_DENIED, SAVE_ERROR, INTERNAL_ERROR,
+    DB_CONNECTION_ERROR, DB_CONNECTION_ERROR_SHORT, SUPABASE_CONNECTION_ERROR,
+    FIBRA_MISSING_FIELDS, QUANTICA_MISSING_FIELDS, SCHEMA_TEST_FAILED,
+    INDEX_NOT_FOUND, NOT_FOUND, HEALTHY, UNHEALTHY, CONTENT_UNAVAILABLE,
+)
 
 # Load environment variables
 load_dotenv()
@@ -17,10 +30,44 @@ CORS(app)  # Allow cross-origin requests from the frontend
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Optional anonymized request log for load rehearsals (TRAFFIC_CAPTURE_FILE)
+traffic_capture = init_traffic_capture(app)
+
 # Supabase connection
 SUPABASE_URL = os.getenv('SUPABASE_URL')
 # Prefer service role key on the server (bypasses RLS); fallback to anon key if not provided
 SUPABASE_KEY = os.getenv('SUPABASE_SERVICE_ROLE_KEY') or os.getenv('SUPABASE_KEY')
+# Token required by organizer-only endpoints (header X-Admin-Token); disabled when unset
+ADMIN_TOKEN = os.getenv('ADMIN_TOKEN')
+
+# E-mail/team-name index used to reject conflicting hackathon teams before the insert
+hackathon_index = HackathonTeamIndex()
+
+# Speakers and agenda, rendered from a single JSON file (hot-reloaded when it changes)
+content_store = ContentStore(os.getenv('CONTENT_FILE') or DEFAULT_CONTENT_FILE)
+try:
+    content_store.load()
+except Exception as e:
+    logger.error(f"Event content not loaded at startup: {e}")
+
+# Minified pages and bundles generated by build.py; the source files are served when absent
+BUILD_DIR = os.getenv('BUILD_DIR') or DEFAULT_OUTPUT
+build_manifest = load_manifest(BUILD_DIR)
+# Source files of each built page; a page whose sources changed after the build is served from source
+build_sources = load_sources(BUILD_DIR)
+stale_pages = set()
+if build_manifest:
+    logger.info(f"Serving built pages from {BUILD_DIR} ({len(build_manifest)} with preload hints)")
+# Bundle names carry a content hash, so browsers and CDNs may keep them for good
+ASSET_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+
+# static_proxy serves the project root, which also holds .env, sources, SQL and data:
+# only these extensions are public, never dotfiles or the directories below
+PUBLIC_EXTENSIONS = frozenset({
+    '.html', '.css', '.js', '.png', '.jpg', '.jpeg', '.gif', '.svg', '.webp', '.avif', '.ico',
+    '.woff', '.woff2', '.ttf', '.pdf',
+})
+PRIVATE_DIRS = frozenset({'api', 'archive', 'benchmarks', 'data', 'dist', 'site IEEE', '__pycache__'})
 
 
 def sanitize_text(value: str, max_length: int = 200) -> str:
@@ -69,6 +116,38 @@ def get_supabase_client():
         logger.error(f"Supabase client error: {e}")
         return None
 
+def is_admin_request() -> bool:
+    """Check the organizer token sent in the X-Admin-Token header."""
+    if not ADMIN_TOKEN:
+        return False
+    token = request.headers.get('X-Admin-Token') or ''
+    return hmac.compare_digest(token.encode('utf-8'), ADMIN_TOKEN.encode('utf-8'))
+
+def warm_hackathon_index(supabase=None) -> bool:
+    """Load hackathon teams into the in-memory conflict index"""
+    supabase = supabase or get_supabase_client()
+    if not supabase:
+        return False
+
+    try:
+        total = hackathon_index.warm(supabase)
+        logger.info(f"Hackathon index warmed with {total} teams")
+        return True
+    except Exception as e:
+        logger.error(f"Failed to warm hackathon index: {e}")
+        return False
+
+def hackathon_conflict_response(error, claim, supabase):
+    """409 for a unique violation from the database, or None for any other error."""
+    conflicts = constraint_conflicts(error)
+    if not conflicts:
+        return None
+    hackathon_index.release(claim)
+    # Outro worker inscreveu a equipe conflitante: atualiza o índice deste processo
+    logger.warning("Conflito de equipe detectado pelo banco", extra={'error': str(error)})
+    warm_hackathon_index(supabase)
+    return json_response({'success': False, 'message': describe_conflicts(conflicts)}, 409)
+
 def create_table_if_not_exists():
     """Create inscricoes table if it doesn't exist"""
     supabase = get_supabase_client()
@@ -97,10 +176,7 @@ def submit_inscricao():
         
         if not data:
             logger.warning("No data received in request")
-            return jsonify({
-                'success': False, 
-                'message': 'Nenhum dado recebido'
-            }), 400
+            return NO_DATA.response()
         
         # Validate required fields
         required_fields = ['nome', 'email', 'telefone', 'faculdade', 'curso', 'ingresso']
@@ -108,27 +184,21 @@ def submit_inscricao():
         
         if missing_fields:
             logger.warning(f"Missing required fields: {missing_fields}")
-            return jsonify({
+            return json_response({
                 'success': False,
                 'message': f'Campos obrigatórios não preenchidos: {", ".join(missing_fields)}'
-            }), 400
+            }, 400)
         
         # Honeypot check
         if data.get('_hp'):
             logger.warning(f"Spam attempt detected from IP: {request.remote_addr}")
-            return jsonify({
-                'success': False,
-                'message': 'Erro de validação'
-            }), 400
+            return VALIDATION_ERROR.response()
         
         # Connect to Supabase
         supabase = get_supabase_client()
         if not supabase:
             logger.error("Failed to connect to Supabase")
-            return jsonify({
-                'success': False,
-                'message': 'Erro de conexão com o banco de dados'
-            }), 500
+            return DB_CONNECTION_ERROR.response()
         
         try:
             # Insert data using Supabase client
@@ -153,18 +223,16 @@ def submit_inscricao():
             if result.data:
                 inscription_id = result.data[0]['id']
                 logger.info(f"Successfully saved inscription ID: {inscription_id} for {data.get('nome')} ({data.get('email')})")
+                enqueue_confirmation_email('sanca-week', data.get('email'), data.get('nome'))
                 
-                return jsonify({
+                return json_response({
                     'success': True,
                     'message': 'Inscrição enviada com sucesso!',
                     'id': inscription_id
-                }), 200
+                }, 200)
             else:
                 logger.error("No data returned from insert")
-                return jsonify({
-                    'success': False,
-                    'message': 'Erro ao salvar dados'
-                }), 500
+                return SAVE_ERROR.response()
                 
         except Exception as db_error:
             logger.error(f"Supabase error: {db_error}")
@@ -172,24 +240,21 @@ def submit_inscricao():
             # Check if it's a schema-related error
             error_str = str(db_error)
             if 'schema cache' in error_str or 'column' in error_str or 'PGRST204' in error_str:
-                return jsonify({
+                return json_response({
                     'success': False,
                     'message': 'Erro de schema do banco de dados. Execute fix_supabase_schema.sql no Supabase.',
                     'technical_error': error_str
-                }), 500
+                }, 500)
             else:
-                return jsonify({
+                return json_response({
                     'success': False,
                     'message': 'Erro ao salvar dados no banco',
                     'technical_error': error_str
-                }), 500
+                }, 500)
             
     except Exception as e:
         logger.error(f"General error in submit_inscricao: {e}")
-        return jsonify({
-            'success': False,
-            'message': 'Erro interno do servidor'
-        }), 500
+        return INTERNAL_ERROR.response()
 
 @app.route('/api/hackathon', methods=['POST'])
 def submit_hackathon():
@@ -198,21 +263,17 @@ def submit_hackathon():
         logger.info(f"Received hackathon submission from IP: {request.remote_addr}")
         data = request.form if request.form else request.json
         if not data:
-            return jsonify({'success': False, 'message': 'Nenhum dado recebido'}), 400
+            return NO_DATA.response()
 
         # Campos obrigatórios enviados pelo frontend
         required = ['team_name', 'leader_name', 'leader_email', 'celular', 'leader_university']
         missing = [f for f in required if not data.get(f)]
         if missing:
-            return jsonify({'success': False, 'message': f'Campos obrigatórios faltando: {", ".join(missing)}'}), 400
+            return json_response({'success': False, 'message': f'Campos obrigatórios faltando: {", ".join(missing)}'}, 400)
 
         # Honeypot
         if data.get('_hp'):
-            return jsonify({'success': False, 'message': 'Erro de validação'}), 400
-
-        supabase = get_supabase_client()
-        if not supabase:
-            return jsonify({'success': False, 'message': 'Erro de conexão com o banco'}), 500
+            return VALIDATION_ERROR.response()
 
         # Monta o payload com os campos novos, que correspondem à tabela recriada
         payload = {
@@ -234,26 +295,74 @@ def submit_hackathon():
             'terms_accepted': data.get('terms_accepted') == 'on'
         }
 
+        supabase = get_supabase_client()
+        if not supabase:
+            return DB_CONNECTION_ERROR_SHORT.response()
+
+        # Índice em memória: se ainda não carregou (ex.: banco fora do ar no boot), tenta agora.
+        # Se continuar indisponível, o banco segue como fonte da verdade.
+        if not hackathon_index.warmed:
+            warm_hackathon_index(supabase)
+
+        claim = None
+        if hackathon_index.warmed:
+            conflicts, claim = hackathon_index.claim(payload)
+            if conflicts:
+                logger.warning("Conflito de equipe no hackathon", extra={'conflicts': conflicts})
+                return json_response({'success': False, 'message': describe_conflicts(conflicts)}, 409)
+
         try:
             result = supabase.table('hackathon_inscricoes').insert(payload).execute()
 
             # Biblioteca supabase-py armazena erros em result.error sem levantar exceção
             if hasattr(result, 'error') and result.error:
+                conflict = hackathon_conflict_response(result.error, claim, supabase)
+                if conflict:
+                    return conflict
+                hackathon_index.release(claim)
                 status_code, message, error_str = format_supabase_error(result.error)
                 logger.error("Erro Supabase hackathon", extra={'status_code': status_code, 'error': error_str})
-                return jsonify({'success': False, 'message': message, 'technical_error': error_str}), status_code
+                return json_response({'success': False, 'message': message, 'technical_error': error_str}, status_code)
 
             if result.data:
-                return jsonify({'success': True, 'message': 'Inscrição do hackathon enviada com sucesso!', 'id': result.data[0]['id']}), 200
-
-            return jsonify({'success': False, 'message': 'Erro ao salvar dados'}), 500
+                team_id = result.data[0]['id']
+                if claim is not None:
+                    hackathon_index.commit(claim, team_id)
+                for prefix in ('leader', 'member2', 'member3'):
+                    enqueue_confirmation_email('hackathon', payload.get(f'{prefix}_email'), payload.get(f'{prefix}_name'), team_name=payload['team_name'])
+                return json_response({'success': True, 'message': 'Inscrição do hackathon enviada com sucesso!', 'id': team_id}, 200)
+
+            hackathon_index.release(claim)
+            return SAVE_ERROR.response()
         except Exception as e:
+            conflict = hackathon_conflict_response(e, claim, supabase)
+            if conflict:
+                return conflict
+            hackathon_index.release(claim)
             status_code, message, error_str = format_supabase_error(e)
             logger.error("Hackathon Supabase error", extra={'error': error_str, 'status_code': status_code})
-            return jsonify({'success': False, 'message': message, 'technical_error': error_str}), status_code
+            return json_response({'success': False, 'message': message, 'technical_error': error_str}, status_code)
     except Exception as e:
         logger.error(f"General error in submit_hackathon: {e}")
-        return jsonify({'success': False, 'message': 'Erro interno do servidor'}), 500
+        return INTERNAL_ERROR.response()
+
+@app.route('/api/hackathon/conflitos', methods=['GET'])
+def hackathon_conflicts():
+    """Organizer report of people in several teams and duplicated team names"""
+    if not is_admin_request():
+        return ACCESS_DENIED.response()
+
+    try:
+        # ?refresh=1 recarrega o índice a partir do banco antes de gerar o relatório
+        if request.args.get('refresh') or not hackathon_index.warmed:
+            if not warm_hackathon_index():
+                return DB_CONNECTION_ERROR.response()
+
+        report = hackathon_index.report()
+        return json_response({'success': True, **report}, 200)
+    except Exception as e:
+        logger.error(f"Erro no relatório de conflitos do hackathon: {e}")
+        return INTERNAL_ERROR.response()
 
 @app.route('/api/minicurso-fibra', methods=['POST'])
 def submit_minicurso_fibra():
@@ -264,11 +373,11 @@ def submit_minicurso_fibra():
 
         if not data:
             logger.warning("Nenhum dado recebido para minicurso fibra")
-            return jsonify({'success': False, 'message': 'Nenhum dado recebido'}), 400
+            return NO_DATA.response()
 
         if data.get('_hp'):
             logger.warning("Tentativa de spam detectada no minicurso fibra")
-            return jsonify({'success': False, 'message': 'Erro de validação'}), 400
+            return VALIDATION_ERROR.response()
 
         nome = sanitize_text(data.get('nome', ''), 150)
         telefone = sanitize_text(data.get('telefone', ''), 50)
@@ -276,7 +385,7 @@ def submit_minicurso_fibra():
 
         if not nome or not telefone:
             logger.warning("Campos obrigatórios faltando no minicurso fibra", extra={'nome': bool(nome), 'telefone': bool(telefone)})
-            return jsonify({'success': False, 'message': 'Informe nome completo e telefone.'}), 400
+            return FIBRA_MISSING_FIELDS.response()
 
         logger.info(
             "Valid minicurso fibra payload",
@@ -290,7 +399,7 @@ def submit_minicurso_fibra():
         supabase = get_supabase_client()
         if not supabase:
             logger.error("Falha ao conectar ao Supabase para minicurso fibra")
-            return jsonify({'success': False, 'message': 'Erro de conexão com o banco de dados'}), 500
+            return DB_CONNECTION_ERROR.response()
 
         payload = {
             'nome': nome,
@@ -305,23 +414,23 @@ def submit_minicurso_fibra():
             if hasattr(result, 'error') and result.error:
                 status_code, message, error_str = format_supabase_error(result.error)
                 logger.error("Erro Supabase (payload validado) ", extra={'status_code': status_code, 'error': error_str})
-                return jsonify({'success': False, 'message': message, 'technical_error': error_str}), status_code
+                return json_response({'success': False, 'message': message, 'technical_error': error_str}, status_code)
 
             if result.data:
                 registro_id = result.data[0]['id']
                 logger.info(f"Inscrição do minicurso fibra salva com ID {registro_id}")
-                return jsonify({'success': True, 'message': 'Inscrição registrada com sucesso!', 'id': registro_id}), 200
+                return json_response({'success': True, 'message': 'Inscrição registrada com sucesso!', 'id': registro_id}, 200)
 
             logger.error("Nenhum dado retornado na inserção do minicurso fibra", extra={'result': getattr(result, 'data', None)})
-            return jsonify({'success': False, 'message': 'Erro ao salvar dados'}), 500
+            return SAVE_ERROR.response()
         except Exception as db_error:
             status_code, message, error_str = format_supabase_error(db_error)
             logger.error("Erro Supabase minicurso fibra", extra={'error': error_str, 'status_code': status_code})
-            return jsonify({'success': False, 'message': message, 'technical_error': error_str}), status_code
+            return json_response({'success': False, 'message': message, 'technical_error': error_str}, status_code)
 
     except Exception as e:
         logger.error(f"Erro geral no minicurso fibra: {e}")
-        return jsonify({'success': False, 'message': 'Erro interno do servidor'}), 500
+        return INTERNAL_ERROR.response()
 
 @app.route('/api/minicurso-quantica', methods=['POST'])
 def submit_minicurso_quantica():
@@ -332,11 +441,11 @@ def submit_minicurso_quantica():
 
         if not data:
             logger.warning("Nenhum dado recebido para minicurso quântica")
-            return jsonify({'success': False, 'message': 'Nenhum dado recebido'}), 400
+            return NO_DATA.response()
 
         if data.get('_hp'):
             logger.warning("Tentativa de spam detectada no minicurso quântica")
-            return jsonify({'success': False, 'message': 'Erro de validação'}), 400
+            return VALIDATION_ERROR.response()
 
         nome = sanitize_text(data.get('nome', ''), 150)
         telefone = sanitize_text(data.get('telefone', ''), 50)
@@ -345,12 +454,12 @@ def submit_minicurso_quantica():
 
         if not nome or not telefone or not email:
             logger.warning("Campos obrigatórios faltando no minicurso quântica")
-            return jsonify({'success': False, 'message': 'Informe nome completo, telefone e e-mail.'}), 400
+            return QUANTICA_MISSING_FIELDS.response()
 
         supabase = get_supabase_client()
         if not supabase:
             logger.error("Falha ao conectar ao Supabase para minicurso quântica")
-            return jsonify({'success': False, 'message': 'Erro de conexão com o banco de dados'}), 500
+            return DB_CONNECTION_ERROR.response()
 
         payload = {
             'nome': nome,
@@ -366,23 +475,41 @@ def submit_minicurso_quantica():
             if hasattr(result, 'error') and result.error:
                 status_code, message, error_str = format_supabase_error(result.error)
                 logger.error("Erro Supabase minicurso quântica", extra={'status_code': status_code, 'error': error_str})
-                return jsonify({'success': False, 'message': message, 'technical_error': error_str}), status_code
+                return json_response({'success': False, 'message': message, 'technical_error': error_str}, status_code)
 
             if result.data:
                 registro_id = result.data[0]['id']
                 logger.info(f"Inscrição do minicurso quântica salva com ID {registro_id}")
-                return jsonify({'success': True, 'message': 'Inscrição registrada com sucesso!', 'id': registro_id}), 200
+                enqueue_confirmation_email('minicurso-quantica', email, nome)
+                return json_response({'success': True, 'message': 'Inscrição registrada com sucesso!', 'id': registro_id}, 200)
 
             logger.error("Nenhum dado retornado na inserção do minicurso quântica")
-            return jsonify({'success': False, 'message': 'Erro ao salvar dados'}), 500
+            return SAVE_ERROR.response()
         except Exception as db_error:
             status_code, message, error_str = format_supabase_error(db_error)
             logger.error("Erro Supabase minicurso quântica", extra={'error': error_str, 'status_code': status_code})
-            return jsonify({'success': False, 'message': message, 'technical_error': error_str}), status_code
+            return json_response({'success': False, 'message': message, 'technical_error': error_str}, status_code)
 
     except Exception as e:
         logger.error(f"Erro geral no minicurso quântica: {e}")
-        return jsonify({'success': False, 'message': 'Erro interno do servidor'}), 500
+        return INTERNAL_ERROR.response()
+
+def serve_content_section(name: str):
+    """Serve a pre-rendered section of data/evento.json with ETag and gzip"""
+    section = content_store.get(name)
+    if section is None:
+        return CONTENT_UNAVAILABLE.response()
+    return section_response(section, request)
+
+@app.route('/api/speakers', methods=['GET'])
+def get_speakers():
+    """List speakers from the event content file"""
+    return serve_content_section('speakers')
+
+@app.route('/api/agenda', methods=['GET'])
+def get_agenda():
+    """List the schedule (days and slots) from the event content file"""
+    return serve_content_section('agenda')
 
 @app.route('/api/health', methods=['GET'])
 def health_check():
@@ -393,28 +520,22 @@ def health_check():
             # Test connection by trying to select from inscricoes table
             try:
                 result = supabase.table('inscricoes').select('id').limit(1).execute()
-                return jsonify({
-                    'status': 'healthy',
-                    'database': 'connected'
-                }), 200
+                return HEALTHY.response()
             except Exception as e:
-                return jsonify({
+                return json_response({
                     'status': 'healthy',
                     'database': 'connected_but_table_missing',
                     'note': 'Execute create_table.sql in Supabase',
                     'error': str(e)
-                }), 200
+                }, 200)
         else:
-            return jsonify({
-                'status': 'unhealthy',
-                'database': 'disconnected'
-            }), 500
+            return UNHEALTHY.response()
     except Exception as e:
         logger.error(f"Health check error: {e}")
-        return jsonify({
+        return json_response({
             'status': 'error',
             'message': str(e)
-        }), 500
+        }, 500)
 
 @app.route('/api/test-schema', methods=['GET'])
 def test_schema():
@@ -422,10 +543,7 @@ def test_schema():
     try:
         supabase = get_supabase_client()
         if not supabase:
-            return jsonify({
-                'success': False,
-                'message': 'Erro de conexão com o Supabase'
-            }), 500
+            return SUPABASE_CONNECTION_ERROR.response()
         
         # Try to describe the table structure
         try:
@@ -446,42 +564,77 @@ def test_schema():
                 # Delete the test record
                 supabase.table('inscricoes').delete().eq('email', 'teste@teste.com').execute()
                 
-                return jsonify({
+                return json_response({
                     'success': True,
                     'message': 'Schema está funcionando corretamente',
                     'columns_working': list(test_data.keys())
-                }), 200
+                }, 200)
             else:
-                return jsonify({
-                    'success': False,
-                    'message': 'Falha na inserção de teste'
-                }), 500
+                return SCHEMA_TEST_FAILED.response()
                 
         except Exception as schema_error:
             logger.error(f"Schema test error: {schema_error}")
-            return jsonify({
+            return json_response({
                 'success': False,
                 'message': f'Erro de schema: {str(schema_error)}',
                 'suggestion': 'Execute fix_supabase_schema.sql no Supabase'
-            }), 500
+            }, 500)
             
     except Exception as e:
         logger.error(f"Test schema error: {e}")
-        return jsonify({
+        return json_response({
             'success': False,
             'message': str(e)
-        }), 500
+        }, 500)
+
+def built_page_is_current(filename: str) -> bool:
+    """False (with a warning, once per page) when a source was edited after the build."""
+    stale = stale_sources(BUILD_DIR, filename, build_sources.get(filename))
+    if not stale:
+        stale_pages.discard(filename)
+        return True
+    if filename not in stale_pages:
+        stale_pages.add(filename)
+        logger.warning(f"{BUILD_DIR}/{filename} is older than {', '.join(stale)}; "
+                       f"serving the source files until `python build.py` is run again")
+    return False
+
+
+# Report pages edited since the last build at startup, not only on their first request
+if build_manifest:
+    for page in build_sources:
+        built_page_is_current(page)
+
+
+def is_public_path(path: str) -> bool:
+    """True for front-end files (pages, styles, scripts, images, fonts) outside private directories."""
+    parts = path.split('/')
+    if any(not part or part.startswith('.') for part in parts):
+        return False
+    if parts[0] in PRIVATE_DIRS:
+        return False
+    return os.path.splitext(path)[1].lower() in PUBLIC_EXTENSIONS
+
+
+def send_page(filename: str):
+    """Serve an HTML page, preferring the built copy and announcing its bundles."""
+    if (build_manifest and os.path.isfile(os.path.join(BUILD_DIR, filename))
+            and built_page_is_current(filename)):
+        response = send_from_directory(BUILD_DIR, filename)
+        # A CDN in front of the app (e.g. Cloudflare) turns these into 103 Early Hints
+        if filename in build_manifest:
+            response.headers['Link'] = build_manifest[filename]
+        return response
+    return send_from_directory('.', filename)
+
 
 @app.route('/')
 def index():
     """Serve homepage"""
     try:
-        return send_file('index.html')
+        return send_page('index.html')
     except Exception:
-        return jsonify({
-            'success': False,
-            'message': 'Arquivo index.html não encontrado'
-        }), 404
+        return INDEX_NOT_FOUND.response()
 
 
 @app.route('/<path:path>')
@@ -491,15 +644,23 @@ def static_proxy(path: str):
     if path.startswith('api/'):
         abort(404)
 
-    # Serve existing files directly
-    if os.path.isfile(path):
+    # Content-hashed bundles generated by build.py
+    if path.startswith('assets/') and is_public_path(path) and os.path.isfile(os.path.join(BUILD_DIR, path)):
+        response = send_from_directory(BUILD_DIR, path)
+        response.headers['Cache-Control'] = ASSET_CACHE_CONTROL
+        return response
+
+    # Serve existing front-end files directly
+    if is_public_path(path) and os.path.isfile(path):
+        if path.endswith('.html'):
+            return send_page(path)
         return send_from_directory('.', path)
 
     # Convenience: allow routes without .html extension (e.g., /palestrantes)
-    if os.path.isfile(f"{path}.html"):
-        return send_from_directory('.', f"{path}.html")
+    if is_public_path(f"{path}.html") and os.path.isfile(f"{path}.html"):
+        return send_page(f"{path}.html")
 
-    return jsonify({'error': 'Not found'}), 404
+    return NOT_FOUND.response()
 
 if __name__ == '__main__':
     # Create table on startup
@@ -507,6 +668,9 @@ if __name__ == '__main__':
         logger.info("Database setup completed successfully")
     else:
         logger.error("Failed to setup database")
+
+    warm_hackathon_index()
+    start_inprocess_workers()
     
     # Run the app
     app.run(debug=True, host='127.0.0.1', port=5000)
\ No newline at end of file
@@ -1,7 +1,10 @@
 // Speakers Page JavaScript - MIT Media Lab Style
 
 // DOM Elements
-const speakerCards = document.querySelectorAll('.speaker-card');
+const speakersList = document.getElementById('speakers-list');
+// Filled by renderSpeakers() once /api/speakers answers
+let speakerCards = [];
+let speakerIds = [];
 const speakerDetails = document.querySelectorAll('.speaker-details');
 const expandButtons = document.querySelectorAll('.speaker-card__expand');
 const closeButtons = document.querySelectorAll('.speaker-details__close');
@@ -70,7 +73,6 @@ document.addEventListener('keydown', (e) => {
     const activeModal = document.querySelector('.speaker-details.active');
     if (activeModal) {
         const currentId = activeModal.id.replace('speaker-', '');
-        const speakerIds = ['alexandre', 'mariangela', 'lucas', 'ricardo', 'rui', 'pedro'];
         const currentIndex = speakerIds.indexOf(currentId);
         
         if (e.key === 'ArrowRight' || e.key === 'ArrowDown') {
@@ -87,6 +89,55 @@ document.addEventListener('keydown', (e) => {
     }
 });
 
+// Speaker cards rendered from data/evento.json (GET /api/speakers)
+function escapeHtml(value) {
+    return String(value ?? '').replace(/[&<>"']/g, (ch) => ({
+        '&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;', "'": '&#39;'
+    }[ch]));
+}
+
+function speakerCardHtml(speaker) {
+    const id = escapeHtml(speaker.id);
+    const tags = (speaker.expertise || [])
+        .map(tag => `<span class="expertise-tag">${escapeHtml(tag)}</span>`)
+        .join('');
+    return `
+        <div class="speaker-card" id="${id}" data-speaker="${id}">
+            <div class="speaker-card__image">
+                <img src="${escapeHtml(encodeURI(speaker.photo))}" alt="${escapeHtml(speaker.name)}" class="speaker__photo" loading="lazy">
+            </div>
+            <div class="speaker-card__content">
+                <h3 class="speaker-card__name">${escapeHtml(speaker.name)}</h3>
+                <p class="speaker-card__title">${escapeHtml(speaker.title)}</p>
+                <p class="speaker-card__description">${escapeHtml(speaker.description)}</p>
+                <div class="speaker-card__expertise">${tags}</div>
+            </div>
+        </div>`;
+}
+
+async function renderSpeakers() {
+    if (!speakersList) return;
+    try {
+        const response = await fetch('/api/speakers');
+        if (!response.ok) throw new Error(`HTTP ${response.status}`);
+        const { speakers } = await response.json();
+        speakersList.innerHTML = speakers.map(speakerCardHtml).join('');
+        speakerIds = speakers.map(speaker => speaker.id);
+    } catch (err) {
+        console.error('Falha ao carregar palestrantes:', err);
+        speakersList.innerHTML = '<p class="speakers-grid__status">Não foi possível carregar os palestrantes. Tente recarregar a página.</p>';
+    } finally {
+        speakersList.setAttribute('aria-busy', 'false');
+    }
+    speakerCards = speakersList.querySelectorAll('.speaker-card');
+
+    // Links como palestrantes.html#bruno chegam antes dos cards existirem
+    const target = window.location.hash && document.getElementById(window.location.hash.slice(1));
+    if (target) {
+        target.scrollIntoView();
+    }
+}
+
 // MIT Media Lab Style Scroll Effects (disabled: cards visible by default)
 function initScrollEffects() {
     speakerCards.forEach(card => {
@@ -175,11 +226,13 @@ function initTypingEffect() {
 }
 
 // Initialize MIT Media Lab style interactions
-document.addEventListener('DOMContentLoaded', () => {
-    initScrollEffects();
+document.addEventListener('DOMContentLoaded', async () => {
     initParallaxEffects();
-    initHoverEffects();
     initTypingEffect();
+
+    await renderSpeakers();
+    initScrollEffects();
+    initHoverEffects();
     
     // Add MIT style loading animation
     document.body.classList.add('loaded');
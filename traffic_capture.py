@@ -0,0 +1,163 @@
+"""Optional request capture for load rehearsals.
+
+When ``TRAFFIC_CAPTURE_FILE`` is set, every request handled by the Flask app is
+appended to that file as one compact JSON line. Only the *shape* of the request
+is stored, never the submitted values:
+
+    {"t":1729350000.123,"m":"POST","p":"/api/hackathon","r":"/api/hackathon",
+     "s":200,"d":184.2,"c":"f","b":{"team_name":"s12","leader_email":"e21",...}}
+
+- ``t``  arrival time (epoch seconds)       - ``s`` response status
+- ``m``  method                             - ``d`` handling time in ms
+- ``p``  path, ``r`` matched route          - ``c`` body kind: f=form, j=json
+- ``b``  body shape, ``q`` query shape: ``s``=text, ``e``=e-mail, ``d``=digits,
+  ``b``=boolean, followed by the value length
+
+Lines are handed to a background thread so the request path only pays for a
+queue put. ``benchmarks/replay_traffic.py`` plays the file back.
+"""
+
+import atexit
+import json
+import logging
+import os
+import queue
+import random
+import threading
+import time
+
+from flask import g, request
+
+logger = logging.getLogger(__name__)
+
+FLUSH_INTERVAL = 0.5
+MAX_PENDING = 10000
+
+
+def value_shape(value) -> str:
+    """Describe a value by kind and length without keeping its content."""
+    if isinstance(value, bool) or value in ('on', 'true', 'false'):
+        return 'b'
+    if value is None:
+        return 'n'
+    if not isinstance(value, str):
+        value = json.dumps(value, ensure_ascii=False)
+    if '@' in value:
+        return f'e{len(value)}'
+    if value.isdigit():
+        return f'd{len(value)}'
+    return f's{len(value)}'
+
+
+def mapping_shape(data) -> dict:
+    return {key: value_shape(data.get(key)) for key in data.keys()}
+
+
+class TrafficCapture:
+    """Flask extension that records anonymized request envelopes."""
+
+    def __init__(self, path: str, sample_rate: float = 1.0):
+        self.path = path
+        self.sample_rate = sample_rate
+        self._queue = queue.Queue(maxsize=MAX_PENDING)
+        self._writer = None
+        self._writer_pid = None
+        self.dropped = 0
+
+    def init_app(self, app) -> None:
+        app.before_request(self._before_request)
+        app.after_request(self._after_request)
+
+    def _before_request(self):
+        if self.sample_rate >= 1.0 or random.random() < self.sample_rate:
+            g._capture_start = time.perf_counter()
+            g._capture_time = time.time()
+
+    def _after_request(self, response):
+        start = g.pop('_capture_start', None)
+        if start is None:
+            return response
+
+        try:
+            envelope = {
+                't': round(g.pop('_capture_time'), 3),
+                'm': request.method,
+                'p': request.path,
+                'r': request.url_rule.rule if request.url_rule else None,
+                's': response.status_code,
+                'd': round((time.perf_counter() - start) * 1000, 1),
+            }
+            if request.args:
+                envelope['q'] = mapping_shape(request.args)
+            if request.form:
+                envelope['c'] = 'f'
+                envelope['b'] = mapping_shape(request.form)
+            elif request.is_json:
+                body = request.get_json(silent=True)
+                if isinstance(body, dict):
+                    envelope['c'] = 'j'
+                    envelope['b'] = mapping_shape(body)
+            self._enqueue(json.dumps(envelope, ensure_ascii=False, separators=(',', ':')))
+        except Exception as e:
+            logger.error(f"Traffic capture error: {e}")
+        return response
+
+    def _enqueue(self, line: str) -> None:
+        # Gunicorn forks after preload: start one writer thread per worker process
+        if self._writer_pid != os.getpid():
+            self._writer_pid = os.getpid()
+            self._writer = threading.Thread(target=self._write_loop, name='traffic-capture', daemon=True)
+            self._writer.start()
+            atexit.register(self.flush)
+        try:
+            self._queue.put_nowait(line)
+        except queue.Full:
+            self.dropped += 1
+
+    def flush(self) -> None:
+        """Write whatever is still queued (called at interpreter exit)."""
+        lines = []
+        while True:
+            try:
+                lines.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        self._write(lines)
+
+    def _write_loop(self) -> None:
+        while True:
+            lines = [self._queue.get()]
+            deadline = time.monotonic() + FLUSH_INTERVAL
+            while time.monotonic() < deadline:
+                try:
+                    lines.append(self._queue.get(timeout=max(0.0, deadline - time.monotonic())))
+                except queue.Empty:
+                    break
+            self._write(lines)
+
+    def _write(self, lines) -> None:
+        if not lines:
+            return
+        try:
+            # O_APPEND keeps each batch contiguous when several workers share the file
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write('\n'.join(lines) + '\n')
+        except OSError as e:
+            logger.error(f"Traffic capture write error: {e}")
+
+
+def init_traffic_capture(app):
+    """Enable capture when TRAFFIC_CAPTURE_FILE is set; returns the extension or None."""
+    path = os.getenv('TRAFFIC_CAPTURE_FILE')
+    if not path:
+        return None
+
+    try:
+        sample_rate = float(os.getenv('TRAFFIC_CAPTURE_SAMPLE', '1'))
+    except ValueError:
+        sample_rate = 1.0
+
+    capture = TrafficCapture(path, sample_rate)
+    capture.init_app(app)
+    logger.info(f"Traffic capture enabled: {path} (sample rate {sample_rate})")
+    return capture